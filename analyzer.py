@@ -1,36 +1,59 @@
+import asyncio
+import hashlib
 import json
+import logging
 import os
+import random
 import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, date
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+import httpx
+import openai
+import redis
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+from django.conf import settings
+from django.core.cache import cache
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 GPT_MODEL_NAME = "gpt-4o"
+# 프롬프트/판정 로직이 바뀌면 올려서 이전 캐시 판정을 무효화
+ANALYZER_VERSION = "2"
+
+# 판정 경로 표기 (결과의 decided_by 값)
+DECIDED_BY_RULE = "rule"
+DECIDED_BY_LLM = "llm"
 
 # --- [1. 수치 계산 및 전처리 함수] ---
 
+MONEY_PATTERN = re.compile(r'(\d[\d,]*(?:\.\d+)?\s*억(?:\s*[\d,]+\s*만)?\s*원?|[\d,]+\s*만\s*원|[\d,]+\s*원)')
+
 def parse_financial_limit_from_criteria(criteria_text: str, keyword: str) -> Optional[int]:
     if keyword not in criteria_text: return None
     start_index = criteria_text.find(keyword)
     search_text = criteria_text[start_index:start_index+100]
-    pattern = re.compile(r'([\d,]+\s*억\s*[\d,]*\s*만?\s*원|[\d,]+\s*만\s*원|[\d,]+\s*원)')
-    match = pattern.search(search_text)
+    # 자산 금액이 없을 때 바로 뒤 자동차가액을 자산 상한으로 읽지 않도록 자름
+    if keyword != "자동차" and "자동차" in search_text:
+        search_text = search_text[:search_text.find("자동차")]
+    match = MONEY_PATTERN.search(search_text)
     if not match: return None
     try:
         cleaned_str = match.group(0).replace(',', '').replace('원', '').replace(' ', '')
         total_amount = 0
         if '억' in cleaned_str:
-            parts = cleaned_str.split('억')
-            if parts[0].isdigit(): total_amount += int(parts[0]) * 100000000
-            if len(parts) > 1 and '만' in parts[1]:
-                man_val = parts[1].replace('만', '')
-                if man_val.isdigit(): total_amount += int(man_val) * 10000
-            elif len(parts) > 1 and parts[1].isdigit():
-                total_amount += int(parts[1])
+            # "1.67억", "3억 5,400만원" 형태
+            eok_part, _, rest = cleaned_str.partition('억')
+            total_amount += round(float(eok_part) * 100000000)
+            if rest.endswith('만') and rest[:-1].isdigit():
+                total_amount += int(rest[:-1]) * 10000
+            elif rest.isdigit():
+                total_amount += int(rest)
         elif '만' in cleaned_str:
             pure_number = cleaned_str.replace('만', '')
             if pure_number.isdigit(): total_amount = int(pure_number) * 10000
@@ -38,6 +61,71 @@ def parse_financial_limit_from_criteria(criteria_text: str, keyword: str) -> Opt
         return total_amount
     except: return None
 
+# 공고 조건 컴파일 형식이 바뀌면 올림 (이전 형식은 분석 시 다시 컴파일)
+CRITERIA_VERSION = 2
+
+# 세대 단위 무주택 요건을 나타내는 문구 (본인 무주택만 요구하는 공고는 LLM 판단에 맡김)
+HOUSEHOLD_NO_HOME_KEYWORDS = ["무주택세대", "무주택 세대"]
+
+AGE_MIN_PATTERN = re.compile(r'만\s*(\d{2})\s*세\s*이상')
+# 연령 상한은 "만 19세 이상 ~ 만 39세 이하"처럼 신청자 연령 범위로 적힌 경우만 인정
+# (자녀 연령, 일부 전형의 상한 등 다른 문맥의 "N세 미만/이하"로 공고 전체를 탈락시키지 않도록)
+AGE_RANGE_PATTERN = re.compile(r'만\s*(\d{2})\s*세\s*이상\s*~?\s*(?:만\s*)?(\d{2})\s*세\s*(이하|미만)')
+INCOME_PERCENT_PATTERN = re.compile(r'(\d{2,3})\s*%')
+
+def build_priority_context(notice_data: Dict[str, Any]) -> str:
+    priority_list = notice_data.get("priority_and_bonus", {}).get("priority_criteria", [])
+    priority_context = ""
+    for p in priority_list:
+        priority_context += f"- {p['priority']}: {' / '.join(p['criteria'])}\n"
+    return priority_context
+
+def compile_notice_criteria(notice_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    공고문 자격 요건 텍스트를 한 번만 파싱해서 구조화된 조건으로 변환 (공고 import 시 저장)
+    - asset_max / car_value_max: 총자산, 자동차가액 상한(원)
+    - income_percents: 본문/순위 기준에 등장하는 소득 기준(%)
+    - age_min / age_max: 연령 범위가 하나로만 적힌 공고의 만 나이 범위
+      (age_max는 같은 구절의 "만 N세 이상 ~ 만 M세 이하" 범위에서만, 애매하면 None → LLM 판단)
+    - marriage_states: 공고문에 언급된 혼인 상태 전형
+    - requires_household_no_home: 세대 단위 무주택 요건 여부
+    - priority_context: 프롬프트에 들어갈 순위 기준 문자열
+    """
+    all_text = notice_data.get("application_eligibility", "") or ""
+    priority_context = build_priority_context(notice_data)
+
+    age_mins = {int(v) for v in AGE_MIN_PATTERN.findall(all_text)}
+    age_maxes = {int(v) - (1 if kind == "미만" else 0) for _, v, kind in AGE_RANGE_PATTERN.findall(all_text)}
+    # 전형별로 연령 기준이 다르거나(청년/신혼부부) 여러 개면 규칙 판정에 쓰지 않음
+    single_age_range = len(age_mins) <= 1 and len(age_maxes) <= 1 and "신혼" not in all_text
+
+    marriage_states = []
+    if "미혼" in all_text or "청년" in all_text:
+        marriage_states.append("single")
+    if "신혼" in all_text or "혼인" in all_text:
+        marriage_states.append("new")
+    if "기혼" in all_text:
+        marriage_states.append("married")
+
+    return {
+        "version": CRITERIA_VERSION,
+        "asset_max": parse_financial_limit_from_criteria(all_text, "자산"),
+        "car_value_max": parse_financial_limit_from_criteria(all_text, "자동차"),
+        "income_percents": sorted({int(v) for v in INCOME_PERCENT_PATTERN.findall(all_text + priority_context)}),
+        "age_min": min(age_mins) if age_mins and single_age_range else None,
+        "age_max": max(age_maxes) if age_maxes and single_age_range else None,
+        "marriage_states": marriage_states,
+        "requires_household_no_home": any(k in all_text for k in HOUSEHOLD_NO_HOME_KEYWORDS),
+        "priority_context": priority_context,
+    }
+
+def get_notice_criteria(notice_data: Dict[str, Any]) -> Dict[str, Any]:
+    """import 시 저장된 조건(compiled_criteria)을 우선 사용하고, 없거나 형식이 옛날이면 즉석 컴파일"""
+    criteria = notice_data.get("compiled_criteria")
+    if isinstance(criteria, dict) and criteria.get("version") == CRITERIA_VERSION:
+        return criteria
+    return compile_notice_criteria(notice_data)
+
 def calculate_age(birth_date_str: str, announcement_date_str: str) -> Optional[int]:
     try:
         if len(birth_date_str) == 6:
@@ -53,15 +141,20 @@ def calculate_age(birth_date_str: str, announcement_date_str: str) -> Optional[i
 def preprocess_user_data(user_data: Dict[str, Any], notice_data: Dict[str, Any]) -> Dict[str, Any]:
     processed_data = {}
     announcement_date_str = notice_data.get("application_schedule", {}).get("announcement_date", "2026.01.01")
-    all_text = notice_data.get("application_eligibility", "")
+    criteria = get_notice_criteria(notice_data)
     
     user_age = calculate_age(user_data.get("birth_date", ""), announcement_date_str)
     processed_data["user_age"] = user_age
     processed_data["is_underage_at_announcement"] = True if user_age is not None and user_age < 19 else False
+    age_max = criteria.get("age_max")
+    processed_data["is_overage_at_announcement"] = True if user_age is not None and age_max and user_age > age_max else False
     
-    notice_asset_max = parse_financial_limit_from_criteria(all_text, "자산")
+    notice_asset_max = criteria.get("asset_max")
     user_asset = user_data.get("total_assets", 0)
     processed_data["asset_match"] = True if not notice_asset_max or user_asset <= notice_asset_max else False
+    notice_car_max = criteria.get("car_value_max")
+    user_car = user_data.get("car_value") or 0
+    processed_data["car_match"] = True if not notice_car_max or user_car <= notice_car_max else False
     income_str = user_data.get("income_range", "100% 이하")
     processed_data["user_income_val"] = int(re.findall(r'\d+', income_str)[0]) if re.findall(r'\d+', income_str) else 100
 
@@ -87,18 +180,413 @@ def preprocess_user_data(user_data: Dict[str, Any], notice_data: Dict[str, Any])
     processed_data["ann_date"] = announcement_date_str
     return processed_data
 
-# --- [2. 강화된 핵심 분석 엔진] ---
+# --- [2. 규칙 기반 사전 판정] ---
 
-def analyze_eligibility_with_ai(user_data: Dict[str, Any], notice_data: Dict[str, Any]) -> Dict[str, Any]:
-    client = OpenAI(api_key=OPENAI_API_KEY)
+def prescreen_eligibility(preprocessed: Dict[str, Any], notice_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    전처리 결과만으로 탈락이 명확한 경우를 LLM 호출 없이 판정
+    - 공고일 기준 만 19세 미만, 또는 공고문 연령 상한 초과
+    - 공고문 자산/자동차가액 기준 초과
+    - 유주택자가 세대 단위 무주택 요건 공고에 신청
+    판정할 수 없는 애매한 경우는 None 반환 → LLM 심사로 넘어감
+    """
+    criteria = get_notice_criteria(notice_data)
+    reasons = []
+
+    if preprocessed["is_underage_at_announcement"]:
+        reasons.append(f"공고일({preprocessed['ann_date']}) 기준 만 {preprocessed['user_age']}세로 만 19세 미만이므로 신청 자격이 없습니다.")
+    if preprocessed["is_overage_at_announcement"]:
+        reasons.append(f"공고일({preprocessed['ann_date']}) 기준 만 {preprocessed['user_age']}세로 연령 기준(만 {criteria['age_max']}세 이하)을 초과합니다.")
+    if not preprocessed["asset_match"]:
+        reasons.append("보유 자산이 공고문의 총자산 기준을 초과합니다.")
+    if not preprocessed["car_match"]:
+        reasons.append("자동차가액이 공고문의 자동차가액 기준을 초과합니다.")
+    if preprocessed["is_home_owner"] and criteria["requires_household_no_home"]:
+        reasons.append("무주택세대구성원 요건을 충족하지 않습니다(유주택 세대).")
+
+    if not reasons:
+        return None
+
+    return {
+        "is_eligible": False,
+        "priority": "",
+        "reasons": reasons,
+        "used_criteria": "application_eligibility",
+        "decided_by": DECIDED_BY_RULE,
+    }
+
+# 프로필 필드 → 판정이 그 필드에 의존하는 공고 조건
+# ALL: 프롬프트/규칙에 항상 들어가는 필드, 조건 키: 해당 조건이 있는 공고만, 빈 리스트: 판정에 쓰이지 않음
+DEPENDS_ON_ALL = "*"
+PROFILE_FIELD_DEPENDENCIES = {
+    "birth_date": [DEPENDS_ON_ALL],
+    "is_married": [DEPENDS_ON_ALL],
+    "residence": [DEPENDS_ON_ALL],
+    "university": [DEPENDS_ON_ALL],
+    "graduate": [DEPENDS_ON_ALL],
+    "employed": [DEPENDS_ON_ALL],
+    "job_seeker": [DEPENDS_ON_ALL],
+    "welfare_receipient": [DEPENDS_ON_ALL],
+    "parents_own_house": [DEPENDS_ON_ALL],
+    "disability_in_family": [DEPENDS_ON_ALL],
+    "subscription_account": [DEPENDS_ON_ALL],
+    "income_range": [DEPENDS_ON_ALL],
+    "total_assets": ["asset_max"],
+    "car_value": ["car_value_max"],
+    "gender": [],
+}
+
+def is_affected_by_profile_change(changed_fields: List[str], criteria: Optional[Dict[str, Any]]) -> bool:
+    """바뀐 프로필 필드가 이 공고의 판정을 바꿀 수 있는지 (조건 정보가 없으면 영향 있다고 봄)"""
+    for field in changed_fields:
+        dependencies = PROFILE_FIELD_DEPENDENCIES.get(field, [DEPENDS_ON_ALL])
+        if DEPENDS_ON_ALL in dependencies:
+            return True
+        if any(not criteria or criteria.get("version") != CRITERIA_VERSION or criteria.get(key) for key in dependencies):
+            return True
+    return False
+
+# 판정에 영향을 주는 전처리 항목 (이 값들이 같으면 같은 공고에서 같은 판정)
+FINGERPRINT_FIELDS = [
+    "user_age", "is_underage_at_announcement", "residence", "is_home_owner",
+    "marriage_text", "welfare_text", "disability_text", "job_education_status",
+    "subscription_count", "user_income_val", "asset_match",
+    "car_match", "is_overage_at_announcement",
+]
+
+def notice_fingerprint_part(notice_data: Dict[str, Any]) -> Dict[str, Any]:
+    """판정에 쓰이는 공고 쪽 입력 (공고 내용이 바뀌면 지문도 바뀜)"""
+    return {
+        "announcement_id": notice_data.get("announcement_id") or notice_data.get("id"),
+        "announcement_date": notice_data.get("application_schedule", {}).get("announcement_date"),
+        "application_eligibility": notice_data.get("application_eligibility"),
+        "priority_and_bonus": notice_data.get("priority_and_bonus"),
+    }
+
+def notice_criteria_hash(notice_data: Dict[str, Any]) -> str:
+    """공고의 판정 관련 부분 해시 (제목/유의사항 수정으로는 바뀌지 않음, 바뀌면 재분석 필요)"""
+    canonical = json.dumps(notice_fingerprint_part(notice_data), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def eligibility_fingerprint(user_data: Dict[str, Any], notice_data: Dict[str, Any]) -> str:
+    """
+    (프로필, 공고) 쌍의 자격 판정 지문
+    판정에 영향을 주는 항목만 모아 해시하므로 같은 지문의 신청자는 분석 결과를 공유할 수 있음
+    """
     preprocessed = preprocess_user_data(user_data, notice_data)
-    
-    priority_list = notice_data.get("priority_and_bonus", {}).get("priority_criteria", [])
-    priority_context = ""
-    for p in priority_list:
-        priority_context += f"- {p['priority']}: {' / '.join(p['criteria'])}\n"
+    payload = json.dumps({
+        "profile": {k: preprocessed.get(k) for k in FINGERPRINT_FIELDS},
+        "notice": notice_fingerprint_part(notice_data),
+        "model": GPT_MODEL_NAME,
+        "version": ANALYZER_VERSION,
+    }, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# --- [3. LLM 판정 캐시] ---
+
+def bump_stat(name: str, amount: int = 1) -> None:
+    # 워커 전체가 공유하는 카운터 (Redis)
+    key = f"analyzer:stats:{name}"
+    try:
+        if not cache.add(key, amount, timeout=None):
+            cache.incr(key, amount)
+    except Exception as e:
+        logger.debug(f"[ANALYZER] 통계 기록 실패 - {name}: {e}")
+
+def get_stats(names: Optional[List[str]] = None) -> Dict[str, int]:
+    names = names or ["verdict_cache_hit", "verdict_cache_miss"]
+    try:
+        values = cache.get_many([f"analyzer:stats:{n}" for n in names])
+    except Exception:
+        values = {}
+    return {n: int(values.get(f"analyzer:stats:{n}", 0)) for n in names}
+
+def verdict_cache_key(messages: List[Dict[str, str]], model: str = GPT_MODEL_NAME) -> str:
+    """렌더링된 프롬프트 + 모델명 + 분석기 버전으로 만든 content-addressed 키"""
+    payload = json.dumps(
+        {"messages": messages, "model": model, "version": ANALYZER_VERSION},
+        ensure_ascii=False, sort_keys=True
+    )
+    return "analyzer:verdict:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def get_cached_verdict(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        verdict = cache.get(key)
+    except Exception as e:
+        logger.warning(f"[ANALYZER] 판정 캐시 조회 실패: {e}")
+        return None
+    bump_stat("verdict_cache_hit" if verdict is not None else "verdict_cache_miss")
+    return verdict
+
+def set_cached_verdict(key: str, verdict: Dict[str, Any]) -> None:
+    timeout = getattr(settings, "ANALYZER_VERDICT_CACHE_TTL", 60 * 60 * 24 * 7)
+    try:
+        cache.set(key, verdict, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"[ANALYZER] 판정 캐시 저장 실패: {e}")
+
+def set_cached_verdicts(verdicts: Dict[str, Dict[str, Any]]) -> None:
+    """여러 판정을 한 번에 저장 ({캐시 키: 판정}, 묶음 응답용)"""
+    if not verdicts:
+        return
+    timeout = getattr(settings, "ANALYZER_VERDICT_CACHE_TTL", 60 * 60 * 24 * 7)
+    try:
+        cache.set_many(verdicts, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"[ANALYZER] 판정 캐시 저장 실패: {e}")
 
-    user_profile_for_ai = {
+# --- [4. LLM 클라이언트: 프로세스당 1개 재사용 + 재시도/백오프] ---
+
+_sync_client: Optional[OpenAI] = None
+_sync_client_pid: Optional[int] = None
+
+def _client_options(base_url: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "api_key": OPENAI_API_KEY,
+        "base_url": base_url or getattr(settings, "OPENAI_BASE_URL", None),
+        "timeout": getattr(settings, "OPENAI_TIMEOUT", 60),
+        # 재시도는 아래 백오프 로직에서 직접 처리
+        "max_retries": 0,
+    }
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=getattr(settings, "OPENAI_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=getattr(settings, "OPENAI_MAX_KEEPALIVE_CONNECTIONS", 10),
+        keepalive_expiry=getattr(settings, "OPENAI_KEEPALIVE_EXPIRY", 30),
+    )
+
+def build_openai_client(base_url: Optional[str] = None) -> OpenAI:
+    """keep-alive 연결 풀을 가진 동기 클라이언트 생성"""
+    return OpenAI(**_client_options(base_url), http_client=httpx.Client(limits=_http_limits()))
+
+def build_async_openai_client(base_url: Optional[str] = None) -> AsyncOpenAI:
+    """비동기 클라이언트 생성 (연결 풀이 이벤트 루프에 묶이므로 분석 실행 단위로 1개 생성해서 재사용)"""
+    return AsyncOpenAI(**_client_options(base_url), http_client=httpx.AsyncClient(limits=_http_limits()))
+
+def get_openai_client() -> OpenAI:
+    """워커 프로세스당 1개의 클라이언트를 만들어 재사용 (fork 이후에는 새로 생성)"""
+    global _sync_client, _sync_client_pid
+    if _sync_client is None or _sync_client_pid != os.getpid():
+        _sync_client = build_openai_client()
+        _sync_client_pid = os.getpid()
+    return _sync_client
+
+def reset_openai_client() -> None:
+    global _sync_client, _sync_client_pid
+    if _sync_client is not None and _sync_client_pid == os.getpid():
+        _sync_client.close()
+    _sync_client = None
+    _sync_client_pid = None
+
+# --- [4-1. 워커 공용 호출 속도 제한: Redis 토큰 버킷] ---
+# 모든 워커가 같은 버킷에서 요청 수(RPM)와 예상 토큰 수(TPM)를 차감하고, 부족하면 채워질 때까지 대기
+# 한도를 interactive 전용 몫(OPENAI_RATE_LIMIT_INTERACTIVE_RESERVE)과 공용 몫으로 나눔
+# - bulk 작업은 공용 버킷만 사용 → 백필이 몰려도 사용자 요청 몫은 항상 남음
+# - interactive는 전용 버킷을 먼저 쓰고, 비어 있으면 공용 버킷에서 차감
+
+RATE_LIMIT_LANE_INTERACTIVE = "interactive"
+RATE_LIMIT_LANE_BULK = "bulk"
+
+_llm_lane: ContextVar[str] = ContextVar("llm_lane", default=RATE_LIMIT_LANE_INTERACTIVE)
+
+@contextmanager
+def use_lane(lane: str):
+    """with 블록 안의 LLM 호출을 지정한 레인 한도로 계산 (asyncio 태스크에도 전달됨)"""
+    token = _llm_lane.set(lane)
+    try:
+        yield
+    finally:
+        _llm_lane.reset(token)
+
+# KEYS: 버킷 키들 / ARGV: 버킷마다 (ms당 충전량, 용량, 차감량)
+# 모든 버킷에 여유가 있을 때만 한꺼번에 차감, 아니면 가장 오래 기다려야 하는 시간(ms) 반환
+_TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local wait = 0
+local levels = {}
+for i = 1, #KEYS do
+    local rate = tonumber(ARGV[(i - 1) * 3 + 1])
+    local capacity = tonumber(ARGV[(i - 1) * 3 + 2])
+    local cost = math.min(tonumber(ARGV[(i - 1) * 3 + 3]), capacity)
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    if tokens < cost then
+        wait = math.max(wait, math.ceil((cost - tokens) / rate))
+    end
+end
+if wait > 0 then
+    return wait
+end
+for i = 1, #KEYS do
+    local rate = tonumber(ARGV[(i - 1) * 3 + 1])
+    local capacity = tonumber(ARGV[(i - 1) * 3 + 2])
+    local cost = math.min(tonumber(ARGV[(i - 1) * 3 + 3]), capacity)
+    redis.call('HSET', KEYS[i], 'tokens', levels[i] - cost, 'ts', now)
+    redis.call('PEXPIRE', KEYS[i], math.ceil(capacity / rate) + 1000)
+end
+return 0
+"""
+
+_redis_client: Optional[redis.Redis] = None
+_redis_client_pid: Optional[int] = None
+_token_bucket = None
+
+def _get_rate_limit_script():
+    global _redis_client, _redis_client_pid, _token_bucket
+    if _redis_client is None or _redis_client_pid != os.getpid():
+        _redis_client = redis.Redis.from_url(settings.OPENAI_RATE_LIMIT_REDIS_URL)
+        _redis_client_pid = os.getpid()
+        _token_bucket = _redis_client.register_script(_TOKEN_BUCKET_SCRIPT)
+    return _token_bucket
+
+def estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    """요청 1건의 예상 토큰 수 (한국어 위주라 2글자당 1토큰으로 보고 응답 몫을 더함)"""
+    prompt_chars = sum(len(m.get("content", "")) for m in messages)
+    return prompt_chars // 2 + getattr(settings, "OPENAI_RATE_LIMIT_COMPLETION_TOKENS", 500)
+
+def _rate_limit_pools(lane: str) -> List[Tuple[str, float]]:
+    """레인이 차감할 수 있는 버킷 묶음 (이름, 한도 중 비율), 앞에서부터 시도"""
+    reserve = getattr(settings, "OPENAI_RATE_LIMIT_INTERACTIVE_RESERVE", 0.0)
+    shared = ("shared", 1.0 - reserve)
+    if lane == RATE_LIMIT_LANE_INTERACTIVE and reserve > 0:
+        return [(RATE_LIMIT_LANE_INTERACTIVE, reserve), shared]
+    return [shared]
+
+def _rate_limit_buckets(pool: str, fraction: float, tokens: int) -> Tuple[List[str], List[float]]:
+    rpm = getattr(settings, "OPENAI_RATE_LIMIT_RPM", None)
+    tpm = getattr(settings, "OPENAI_RATE_LIMIT_TPM", None)
+    keys, args = [], []
+    for name, per_minute, cost in (("req", rpm, 1), ("tok", tpm, tokens)):
+        if not per_minute:
+            continue
+        limit = per_minute * fraction
+        # 용량 = 1초 분량 (버스트 허용 폭), 충전 = 분당 한도
+        keys.append(f"analyzer:ratelimit:{GPT_MODEL_NAME}:{name}:{pool}")
+        args.extend([limit / 60000, max(limit / 60, cost if name == "tok" else 1), cost])
+    return keys, args
+
+def _try_acquire(tokens: int) -> float:
+    """버킷 차감 시도: 0이면 통과, 아니면 다시 시도하기 전 대기 시간(초, 시도한 버킷 중 가장 짧은 값)"""
+    wait = None
+    for pool, fraction in _rate_limit_pools(_llm_lane.get()):
+        keys, args = _rate_limit_buckets(pool, fraction, tokens)
+        if not keys:
+            return 0.0
+        try:
+            delay = int(_get_rate_limit_script()(keys=keys, args=args)) / 1000
+        except redis.RedisError as e:
+            # 제한기 장애로 분석이 멈추지 않도록 통과 (재시도/백오프는 그대로 동작)
+            logger.warning(f"[ANALYZER] 호출 속도 제한 확인 실패, 제한 없이 진행: {e}")
+            return 0.0
+        if delay == 0:
+            return 0.0
+        wait = delay if wait is None else min(wait, delay)
+    return wait or 0.0
+
+def _record_rate_limit_wait(waited: float) -> None:
+    if waited > 0:
+        lane = _llm_lane.get()
+        bump_stat(f"rate_limit_waits:{lane}")
+        bump_stat(f"rate_limit_wait_ms:{lane}", int(waited * 1000))
+
+def acquire_rate_limit(messages: List[Dict[str, str]]) -> float:
+    """호출 전 한도 확보 (동기), 기다린 시간(초) 반환"""
+    tokens = estimate_tokens(messages)
+    waited = 0.0
+    while (delay := _try_acquire(tokens)) > 0:
+        delay += random.uniform(0, delay * 0.1)  # 동시에 깨어나 몰리지 않도록
+        time.sleep(delay)
+        waited += delay
+    _record_rate_limit_wait(waited)
+    return waited
+
+async def acquire_rate_limit_async(messages: List[Dict[str, str]]) -> float:
+    """호출 전 한도 확보 (비동기), 기다린 시간(초) 반환"""
+    tokens = estimate_tokens(messages)
+    waited = 0.0
+    # Redis 호출은 동기라 스레드에서 실행 (이벤트 루프를 막지 않음, 레인 ContextVar는 to_thread가 그대로 전달)
+    while (delay := await asyncio.to_thread(_try_acquire, tokens)) > 0:
+        delay += random.uniform(0, delay * 0.1)
+        await asyncio.sleep(delay)
+        waited += delay
+    if waited > 0:
+        await asyncio.to_thread(_record_rate_limit_wait, waited)
+    return waited
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """재시도 대상(429/5xx/연결 오류)이면 대기 시간(초), 아니면 None"""
+    if isinstance(error, openai.APIStatusError):
+        if error.status_code != 429 and error.status_code < 500:
+            return None
+        retry_after = error.response.headers.get("retry-after") if error.response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), getattr(settings, "OPENAI_BACKOFF_MAX", 20))
+            except ValueError:
+                pass
+    elif not isinstance(error, (openai.APIConnectionError, asyncio.TimeoutError)):
+        return None
+    # full jitter 지수 백오프
+    base = getattr(settings, "OPENAI_BACKOFF_BASE", 0.5)
+    cap = getattr(settings, "OPENAI_BACKOFF_MAX", 20)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def _chat_kwargs(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    return {
+        "model": GPT_MODEL_NAME,
+        "messages": messages,
+        "temperature": 0,
+        "response_format": {"type": "json_object"},
+    }
+
+def request_json(messages: List[Dict[str, str]], client: Optional[OpenAI] = None) -> Any:
+    """chat completion 1건 호출 후 JSON 파싱 (429/5xx는 백오프 후 재시도)"""
+    client = client or get_openai_client()
+    max_retries = getattr(settings, "OPENAI_MAX_RETRIES", 4)
+    attempt = 0
+    while True:
+        try:
+            acquire_rate_limit(messages)
+            bump_stat("llm_call")
+            response = client.chat.completions.create(**_chat_kwargs(messages))
+            return json.loads(response.choices[0].message.content)
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt >= max_retries:
+                raise
+            logger.info(f"[ANALYZER] LLM 호출 재시도 {attempt + 1}/{max_retries} ({delay:.2f}s 후): {e}")
+            attempt += 1
+            time.sleep(delay)
+
+async def request_json_async(messages: List[Dict[str, str]], client: AsyncOpenAI, call_timeout: float) -> Any:
+    max_retries = getattr(settings, "OPENAI_MAX_RETRIES", 4)
+    attempt = 0
+    while True:
+        try:
+            await acquire_rate_limit_async(messages)
+            await asyncio.to_thread(bump_stat, "llm_call")
+            response = await asyncio.wait_for(
+                client.chat.completions.create(**_chat_kwargs(messages)),
+                timeout=call_timeout
+            )
+            return json.loads(response.choices[0].message.content)
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt >= max_retries:
+                raise
+            logger.info(f"[ANALYZER] LLM 호출 재시도 {attempt + 1}/{max_retries} ({delay:.2f}s 후): {e}")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+# --- [5. 강화된 핵심 분석 엔진] ---
+
+def build_user_profile_for_ai(preprocessed: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         "공고일": preprocessed["ann_date"],
         "신청자_만_나이(공고일기준)": f"{preprocessed['user_age']}세",
         "연령_미달_여부": "미달(만 19세 미만)" if preprocessed["is_underage_at_announcement"] else "충족(만 19세 이상)",
@@ -112,22 +600,15 @@ def analyze_eligibility_with_ai(user_data: Dict[str, Any], notice_data: Dict[str
         "보유자산_수준": f"도시근로자 소득 {preprocessed['user_income_val']}% 이하"
     }
 
-    final_check_prompt = f"""
-    당신은 청약 자격을 심사하는 행정 전문가입니다. 
-    [신청자 프로필]을 [공고문 요건]과 대조하여 **논리적 모순 없이** 판단하십시오.
-
-    [신청자 프로필]
-    {json.dumps(user_profile_for_ai, ensure_ascii=False)}
-
-    [공고문 기본 자격 요건]
-    {notice_data.get("application_eligibility", "정보 없음")}
-
-    [순위 결정 기준]
-    {priority_context if priority_context else "상세 순위 기준 없음"}
-
-    [반드시 준수해야 할 논리 심사 규칙]
+def build_review_rules(marriage_text: Optional[str]) -> str:
+    """단건/묶음 프롬프트가 공유하는 심사 규칙 및 출력 지침 (marriage_text가 없으면 신청자별 프로필 값 기준)"""
+    if marriage_text:
+        marriage_line = f"신청자는 현재 **'{marriage_text}'** 상태입니다."
+    else:
+        marriage_line = "각 신청자는 자신의 프로필 **'현재_혼인_상태'** 값에 적힌 상태입니다."
+    return f"""[반드시 준수해야 할 논리 심사 규칙]
     1. **혼인 상태 논리 오류 금지 (매우 중요)**:
-       - 신청자는 현재 **'{preprocessed['marriage_text']}'** 상태입니다.
+       - {marriage_line}
        - 만약 신청자가 '미혼 (싱글)'인데, 공고문에 '신혼부부'와 '청년(미혼)' 전형이 모두 있다면, 반드시 '청년(미혼)' 자격 요건을 기준으로 판단하십시오. 
        - 미혼자에게 "신혼부부 요건을 충족하지 않아 부적격" 혹은 "미혼이 아니므로 신청 불가"라는 식의 앞뒤가 맞지 않는 사유를 절대 생성하지 마십시오.
        - "미혼이라서 기혼자 제외 공고에 적합하지 않다"는 식의 잘못된 해석을 하지 마십시오. 미혼을 우대하거나 허용하는 공고라면 적격입니다.
@@ -141,24 +622,39 @@ def analyze_eligibility_with_ai(user_data: Dict[str, Any], notice_data: Dict[str
 
     [출력 지침]
     1. 'reasons' 배열에는 **오직 탈락의 원인이 되는 미달 요건**만 한국어 문장으로 담으십시오. 충족된 요건은 비우십시오.
-    2. 'priority'에는 신청자가 해당하는 실제 순위(예: "1순위")를 적으십시오. 해당 사항이 없으면 반드시 빈 문자열 ""을 출력하십시오.
+    2. 'priority'에는 신청자가 해당하는 실제 순위(예: "1순위")를 적으십시오. 해당 사항이 없으면 반드시 빈 문자열 ""을 출력하십시오."""
+
+SYSTEM_PROMPT = "너는 행정 서류를 검토하는 냉철한 AI 심사관이다. 신청자의 상태를 공고문과 대조할 때 사실 관계를 오인하지 않으며, 특히 혼인 상태에 따른 전형 구분을 명확히 한다."
+
+def build_eligibility_messages(preprocessed: Dict[str, Any], notice_data: Dict[str, Any]) -> List[Dict[str, str]]:
+    priority_context = get_notice_criteria(notice_data)["priority_context"]
+    user_profile_for_ai = build_user_profile_for_ai(preprocessed)
+
+    final_check_prompt = f"""
+    당신은 청약 자격을 심사하는 행정 전문가입니다. 
+    [신청자 프로필]을 [공고문 요건]과 대조하여 **논리적 모순 없이** 판단하십시오.
+
+    [신청자 프로필]
+    {json.dumps(user_profile_for_ai, ensure_ascii=False)}
+
+    [공고문 기본 자격 요건]
+    {notice_data.get("application_eligibility", "정보 없음")}
+
+    [순위 결정 기준]
+    {priority_context if priority_context else "상세 순위 기준 없음"}
+
+    {build_review_rules(preprocessed['marriage_text'])}
 
     JSON 출력 형식:
     {{ "eligible": bool, "reasons": [], "priority": "문자열" }}
     """
-    
-    response = client.chat.completions.create(
-        model=GPT_MODEL_NAME,
-        messages=[
-            {"role": "system", "content": "너는 행정 서류를 검토하는 냉철한 AI 심사관이다. 신청자의 상태를 공고문과 대조할 때 사실 관계를 오인하지 않으며, 특히 혼인 상태에 따른 전형 구분을 명확히 한다."}, 
-            {"role": "user", "content": final_check_prompt}
-        ],
-        temperature=0,
-        response_format={"type": "json_object"}
-    )
-    
-    ai_res = json.loads(response.choices[0].message.content)
 
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": final_check_prompt}
+    ]
+
+def finalize_ai_result(ai_res: Dict[str, Any]) -> Dict[str, Any]:
     final_eligible = ai_res.get("eligible", False)
     final_reasons = ai_res.get("reasons", [])
     final_priority = ai_res.get("priority", "")
@@ -174,16 +670,427 @@ def analyze_eligibility_with_ai(user_data: Dict[str, Any], notice_data: Dict[str
         "is_eligible": final_eligible,
         "priority": final_priority,
         "reasons": final_reasons,
-        "used_criteria": "application_eligibility"
+        "used_criteria": "application_eligibility",
+        "decided_by": DECIDED_BY_LLM,
     }
 
-# --- [3. 전체 공고 순회부] ---
+# 공고마다 달라지는 프로필 항목 (묶음 프롬프트에서는 공고별로 표기)
+NOTICE_DEPENDENT_PROFILE_KEYS = ["공고일", "신청자_만_나이(공고일기준)", "연령_미달_여부"]
+
+def build_multi_notice_messages(user_data: Dict[str, Any], notices: Dict[Any, Dict[str, Any]],
+                                preprocessed_by_notice: Optional[Dict[Any, Dict[str, Any]]] = None) -> List[Dict[str, str]]:
+    """
+    한 신청자 × 여러 공고를 한 번에 심사하는 프롬프트 (출력은 announcement_id 키의 JSON 객체)
+    preprocessed_by_notice: 이미 전처리한 결과가 있으면 다시 전처리하지 않음
+    """
+    common_profile = None
+    notice_blocks = []
+    for notice_id, notice_data in notices.items():
+        if preprocessed_by_notice is not None:
+            preprocessed = preprocessed_by_notice[notice_id]
+        else:
+            preprocessed = preprocess_user_data(user_data, notice_data)
+        profile = build_user_profile_for_ai(preprocessed)
+        if common_profile is None:
+            common_profile = {k: v for k, v in profile.items() if k not in NOTICE_DEPENDENT_PROFILE_KEYS}
+            marriage_text = preprocessed["marriage_text"]
+        priority_context = get_notice_criteria(notice_data)["priority_context"]
+        notice_blocks.append({
+            "announcement_id": str(notice_id),
+            **{k: profile[k] for k in NOTICE_DEPENDENT_PROFILE_KEYS},
+            "공고문_기본_자격_요건": notice_data.get("application_eligibility", "정보 없음"),
+            "순위_결정_기준": priority_context if priority_context else "상세 순위 기준 없음",
+        })
+
+    batch_prompt = f"""
+    당신은 청약 자격을 심사하는 행정 전문가입니다. 
+    한 명의 [신청자 프로필]을 [공고 목록]의 각 공고와 **따로따로** 대조하여 **논리적 모순 없이** 판단하십시오.
+    공고일, 공고일 기준 나이, 연령 미달 여부는 공고마다 다르므로 각 공고 항목에 적힌 값을 사용하십시오.
+
+    [신청자 프로필]
+    {json.dumps(common_profile, ensure_ascii=False)}
+
+    [공고 목록]
+    {json.dumps(notice_blocks, ensure_ascii=False)}
+
+    {build_review_rules(marriage_text)}
+
+    JSON 출력 형식 (공고 목록의 모든 announcement_id를 키로 사용):
+    {{ "<announcement_id>": {{ "eligible": bool, "reasons": [], "priority": "문자열" }} }}
+    """
+
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": batch_prompt}
+    ]
+
+def build_multi_applicant_messages(notice_data: Dict[str, Any], profiles_for_ai: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """공고 1건 × 신청자 여러 명을 한 번에 심사하는 프롬프트 (출력은 applicant_index별 results 배열)"""
+    priority_context = get_notice_criteria(notice_data)["priority_context"]
+    applicants = [{"applicant_index": idx, **profile} for idx, profile in enumerate(profiles_for_ai)]
+
+    batch_prompt = f"""
+    당신은 청약 자격을 심사하는 행정 전문가입니다. 
+    [신청자 목록]의 각 신청자를 [공고문 요건]과 **따로따로** 대조하여 **논리적 모순 없이** 판단하십시오.
+    한 신청자의 정보를 다른 신청자의 판단에 섞지 마십시오.
+
+    [신청자 목록]
+    {json.dumps(applicants, ensure_ascii=False)}
+
+    [공고문 기본 자격 요건]
+    {notice_data.get("application_eligibility", "정보 없음")}
+
+    [순위 결정 기준]
+    {priority_context if priority_context else "상세 순위 기준 없음"}
+
+    {build_review_rules(None)}
+
+    JSON 출력 형식 (신청자 목록의 모든 applicant_index에 대해 한 항목씩):
+    {{ "results": [ {{ "applicant_index": int, "eligible": bool, "reasons": [], "priority": "문자열" }} ] }}
+    """
+
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": batch_prompt}
+    ]
+
+def is_valid_verdict(verdict: Any) -> bool:
+    """LLM 판정 1건의 스키마 검증 ({eligible: bool, reasons: list, priority: str})"""
+    return (
+        isinstance(verdict, dict)
+        and isinstance(verdict.get("eligible"), bool)
+        and isinstance(verdict.get("reasons", []), list)
+        and isinstance(verdict.get("priority", ""), str)
+    )
+
+class PendingVerdict(NamedTuple):
+    """LLM이 필요한 판정 1건: 전처리/프롬프트/캐시 키를 한 번만 만들어 묶음·단건 호출에 그대로 사용"""
+    preprocessed: Dict[str, Any]
+    messages: List[Dict[str, str]]
+    cache_key: str
+
+def resolve_verdict(user_data: Dict[str, Any], notice_data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[PendingVerdict]]:
+    """규칙 판정 또는 캐시로 끝나면 (결과, None), 아니면 (None, LLM에 보낼 PendingVerdict)"""
+    preprocessed = preprocess_user_data(user_data, notice_data)
+
+    # 명확한 탈락은 규칙으로 바로 판정
+    rule_result = prescreen_eligibility(preprocessed, notice_data)
+    if rule_result is not None:
+        return rule_result, None
+
+    messages = build_eligibility_messages(preprocessed, notice_data)
+
+    # 동일 프롬프트(같은 프로필 × 같은 공고)는 캐시된 판정 재사용
+    cache_key = verdict_cache_key(messages)
+    ai_res = get_cached_verdict(cache_key)
+    if ai_res is not None:
+        return finalize_ai_result(ai_res), None
+    return None, PendingVerdict(preprocessed, messages, cache_key)
+
+def resolve_many(items: Dict[Any, Tuple[Dict[str, Any], Dict[str, Any]]], label: str) -> Tuple[Dict[Any, Dict[str, Any]], Dict[Any, PendingVerdict]]:
+    """
+    {키: (user_data, notice_data)}를 규칙/캐시로 먼저 판정 → ({키: 결과}, {키: LLM에 보낼 PendingVerdict})
+    판정 캐시 조회가 동기 Redis 호출이라 비동기 엔진에서는 asyncio.to_thread로 실행
+    """
+    settled, pending = {}, {}
+    for key, (user_data, notice_data) in items.items():
+        try:
+            result, pending_verdict = resolve_verdict(user_data, notice_data)
+        except Exception as e:
+            logger.warning(f"[ANALYZER] 전처리 실패 - {label}={key}: {e}")
+            continue
+        if result is not None:
+            settled[key] = result
+        else:
+            pending[key] = pending_verdict
+    return settled, pending
+
+def analyze_eligibility_with_ai(user_data: Dict[str, Any], notice_data: Dict[str, Any]) -> Dict[str, Any]:
+    settled, pending = resolve_verdict(user_data, notice_data)
+    if settled is not None:
+        return settled
+
+    ai_res = request_json(pending.messages)
+    set_cached_verdict(pending.cache_key, ai_res)
+
+    return finalize_ai_result(ai_res)
+
+class AnalysisDeadlineExceeded(Exception):
+    """분석 마감 시각이 지나 새 LLM 호출을 시작하지 않음 (남은 공고는 이어서 분석)"""
+
+class _AsyncLLMRunner:
+    """비동기 LLM 호출부 (동시 호출 수 제한 + 호출별 제한 시간 + 선택적 마감 시각)"""
+
+    def __init__(self, max_concurrency: int, call_timeout: float, deadline: Optional[float] = None):
+        self.client = build_async_openai_client()
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.call_timeout = call_timeout
+        # time.monotonic() 기준, 지나면 대기 중인 호출도 시작하지 않음
+        self.deadline = deadline
+
+    def _check_deadline(self):
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise AnalysisDeadlineExceeded()
+
+    async def request_json(self, messages: List[Dict[str, str]]) -> Any:
+        self._check_deadline()
+        async with self.semaphore:
+            self._check_deadline()
+            return await request_json_async(messages, self.client, self.call_timeout)
+
+    async def close(self):
+        await self.client.close()
+
+async def _request_verdict_async(pending: PendingVerdict, runner: _AsyncLLMRunner) -> Dict[str, Any]:
+    """단건 LLM 호출 → 판정 캐시 저장 → 결과"""
+    ai_res = await runner.request_json(pending.messages)
+    await asyncio.to_thread(set_cached_verdict, pending.cache_key, ai_res)
+    return finalize_ai_result(ai_res)
+
+async def analyze_eligibility_with_ai_async(user_data: Dict[str, Any], notice_data: Dict[str, Any], runner: _AsyncLLMRunner) -> Dict[str, Any]:
+    settled, pending = await asyncio.to_thread(resolve_verdict, user_data, notice_data)
+    if settled is not None:
+        return settled
+    return await _request_verdict_async(pending, runner)
+
+async def _request_batch_json(messages: List[Dict[str, str]], runner: _AsyncLLMRunner, label: str) -> Optional[Any]:
+    """
+    묶음 호출 1건
+    - 응답이 JSON이 아니면 {} → 항목 전체를 단건 호출로 대체
+    - 재시도까지 실패한 전송 오류(429/5xx/시간 초과)는 None → 이번 실행에서는 건너뜀
+      (단건 K개로 다시 부르면 속도 제한 상황에서 부하만 K배가 됨)
+    """
+    try:
+        return await runner.request_json(messages)
+    except json.JSONDecodeError as e:
+        logger.warning(f"[ANALYZER] {label} 응답 형식 오류 → 단건 분석으로 대체: {e}")
+        return {}
+    except AnalysisDeadlineExceeded:
+        raise
+    except Exception as e:
+        logger.warning(f"[ANALYZER] {label} 호출 실패 → 이번 실행에서 건너뜀: {e!r}")
+        return None
+
+async def _request_fallback_singles(pending_by_key: Dict[Any, PendingVerdict], runner: _AsyncLLMRunner, label: str) -> Dict[Any, Dict[str, Any]]:
+    """묶음 응답에서 빠지거나 형식이 틀린 항목만 단건 호출"""
+    keys = list(pending_by_key)
+    singles = await asyncio.gather(
+        *(_request_verdict_async(pending_by_key[key], runner) for key in keys),
+        return_exceptions=True
+    )
+    results = {}
+    for key, result in zip(keys, singles):
+        if isinstance(result, AnalysisDeadlineExceeded):
+            continue
+        if isinstance(result, BaseException):
+            logger.warning(f"[ANALYZER] AI 분석 실패 - {label}={key}: {result!r}")
+            continue
+        results[key] = result
+    return results
+
+async def _analyze_notice_batch_async(user_data: Dict[str, Any], batch: Dict[Any, Dict[str, Any]],
+                                      pending: Dict[Any, PendingVerdict], runner: _AsyncLLMRunner) -> Dict[Any, Dict[str, Any]]:
+    """K개 공고를 한 번의 호출로 심사. 응답에서 빠지거나 형식이 틀린 공고만 단건 호출로 대체"""
+    messages = build_multi_notice_messages(
+        user_data, batch, {nid: pending[nid].preprocessed for nid in batch}
+    )
+    try:
+        ai_res = await _request_batch_json(messages, runner, f"묶음 분석(notices={list(batch)})")
+    except AnalysisDeadlineExceeded:
+        return {}
+    if ai_res is None:
+        return {}
+
+    results = {}
+    to_cache = {}
+    for notice_id in batch:
+        verdict = ai_res.get(str(notice_id)) if isinstance(ai_res, dict) else None
+        if is_valid_verdict(verdict):
+            # 공고별 단건 프롬프트 키로 저장 → 다음 실행에서는 resolve_verdict 단계에서 캐시 적중
+            to_cache[pending[notice_id].cache_key] = verdict
+            results[notice_id] = finalize_ai_result(verdict)
+    await asyncio.to_thread(set_cached_verdicts, to_cache)
+
+    fallback = [nid for nid in batch if nid not in results]
+    if fallback:
+        logger.info(f"[ANALYZER] 묶음 응답 누락/형식 오류 {len(fallback)}건 단건 재분석 - notices={fallback}")
+        results.update(await _request_fallback_singles({nid: pending[nid] for nid in fallback}, runner, "notice"))
+    return results
+
+# --- [6. 동시 분석 엔진] ---
+
+async def _analyze_notices_async(user_data: Dict[str, Any], notices: Dict[Any, Dict[str, Any]],
+                                 max_concurrency: int, call_timeout: float, batch_size: int,
+                                 deadline: Optional[float] = None) -> Dict[Any, Dict[str, Any]]:
+    runner = _AsyncLLMRunner(max_concurrency, call_timeout, deadline)
+
+    # 규칙/캐시로 끝나는 공고는 먼저 정리하고, 남은 공고만 LLM으로 (공고마다 전처리/캐시 조회 1번)
+    results, pending = await asyncio.to_thread(
+        resolve_many, {nid: (user_data, nd) for nid, nd in notices.items()}, "notice"
+    )
+
+    async def run_single(notice_id, pending_verdict):
+        try:
+            results[notice_id] = await _request_verdict_async(pending_verdict, runner)
+        except AnalysisDeadlineExceeded:
+            pass
+        except asyncio.TimeoutError:
+            logger.warning(f"[ANALYZER] AI 분석 시간 초과 - notice={notice_id} ({call_timeout}s)")
+        except Exception as e:
+            logger.warning(f"[ANALYZER] AI 분석 실패 - notice={notice_id}: {e}")
+
+    async def run_batch(batch):
+        results.update(await _analyze_notice_batch_async(user_data, batch, pending, runner))
+
+    try:
+        if batch_size > 1 and len(pending) > 1:
+            ids = list(pending)
+            batches = [{nid: notices[nid] for nid in ids[i:i + batch_size]} for i in range(0, len(ids), batch_size)]
+            await asyncio.gather(*(run_batch(batch) for batch in batches))
+        else:
+            await asyncio.gather(*(run_single(nid, pv) for nid, pv in pending.items()))
+    finally:
+        await runner.close()
+    return results
+
+def analyze_notices_concurrently(user_data: Dict[str, Any], notices: Dict[Any, Dict[str, Any]],
+                                 max_concurrency: Optional[int] = None, call_timeout: Optional[float] = None,
+                                 batch_size: Optional[int] = None, deadline: Optional[float] = None) -> Dict[Any, Dict[str, Any]]:
+    """
+    여러 공고를 동시에 분석 ({공고ID: notice_data} → {공고ID: 결과})
+    batch_size > 1이면 LLM 호출 1건에 공고 여러 개를 묶어서 심사
+    실패하거나 시간 초과된 공고는 결과에서 빠짐
+    deadline(time.monotonic() 기준)이 지나면 새 호출을 시작하지 않고 그때까지의 결과만 반환
+    """
+    if not notices:
+        return {}
+    max_concurrency = max_concurrency or getattr(settings, "ANALYZER_MAX_CONCURRENCY", 8)
+    call_timeout = call_timeout or getattr(settings, "ANALYZER_CALL_TIMEOUT", 60)
+    batch_size = batch_size or getattr(settings, "ANALYZER_NOTICE_BATCH_SIZE", 1)
+    return asyncio.run(_analyze_notices_async(user_data, notices, max_concurrency, call_timeout, batch_size, deadline))
+
+# --- [7. 공고 1건 × 신청자 여러 명 묶음 분석] ---
+
+def _parse_applicant_results(ai_res: Any, size: int) -> Dict[int, Dict[str, Any]]:
+    """results 배열 검증: 인덱스 범위와 판정 스키마가 맞는 항목만 채택"""
+    items = ai_res.get("results") if isinstance(ai_res, dict) else None
+    if not isinstance(items, list):
+        return {}
+    verdicts = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        idx = item.get("applicant_index")
+        if isinstance(idx, int) and not isinstance(idx, bool) and 0 <= idx < size and is_valid_verdict(item):
+            verdicts[idx] = item
+    return verdicts
+
+async def _analyze_applicant_chunk_async(notice_data: Dict[str, Any], chunk: List[Tuple[int, PendingVerdict]], runner: _AsyncLLMRunner) -> Dict[int, Dict[str, Any]]:
+    profiles_for_ai = [build_user_profile_for_ai(pending.preprocessed) for _, pending in chunk]
+    messages = build_multi_applicant_messages(notice_data, profiles_for_ai)
+    ai_res = await _request_batch_json(messages, runner, f"신청자 묶음 분석({len(chunk)}명)")
+    if ai_res is None:
+        return {}
+
+    verdicts = _parse_applicant_results(ai_res, len(chunk))
+    results = {}
+    to_cache = {}
+    for idx, verdict in verdicts.items():
+        pos, pending = chunk[idx]
+        # 신청자별 단건 프롬프트 키로 저장 → 다음 실행에서는 resolve_verdict 단계에서 캐시 적중
+        to_cache[pending.cache_key] = verdict
+        results[pos] = finalize_ai_result(verdict)
+    await asyncio.to_thread(set_cached_verdicts, to_cache)
+
+    fallback = {pos: pending for idx, (pos, pending) in enumerate(chunk) if idx not in verdicts}
+    if fallback:
+        logger.info(f"[ANALYZER] 신청자 묶음 응답 누락/형식 오류 {len(fallback)}건 단건 재분석")
+        results.update(await _request_fallback_singles(fallback, runner, "applicant"))
+    return results
+
+async def _analyze_applicants_async(notice_data: Dict[str, Any], user_data_list: List[Dict[str, Any]],
+                                    max_concurrency: int, call_timeout: float, chunk_size: int) -> List[Optional[Dict[str, Any]]]:
+    runner = _AsyncLLMRunner(max_concurrency, call_timeout)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(user_data_list)
+
+    # 규칙/캐시로 끝나는 신청자는 먼저 정리하고, 남은 신청자만 묶어서 LLM으로 (신청자마다 전처리/캐시 조회 1번)
+    settled, pending_by_pos = await asyncio.to_thread(
+        resolve_many, {pos: (user_data, notice_data) for pos, user_data in enumerate(user_data_list)}, "applicant"
+    )
+    for pos, result in settled.items():
+        results[pos] = result
+    pending = list(pending_by_pos.items())
+
+    async def run_chunk(chunk):
+        for pos, result in (await _analyze_applicant_chunk_async(notice_data, chunk, runner)).items():
+            results[pos] = result
+
+    try:
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+    finally:
+        await runner.close()
+    return results
+
+def analyze_applicants_for_notice(notice_data: Dict[str, Any], user_data_list: List[Dict[str, Any]],
+                                  chunk_size: Optional[int] = None, max_concurrency: Optional[int] = None,
+                                  call_timeout: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    공고 1건에 대해 여러 신청자를 분석 (입력 순서와 같은 순서의 결과 리스트)
+    신청자는 공고일 기준으로 전처리한 뒤 chunk_size명씩 묶어 LLM 호출 1건으로 심사
+    실패한 신청자 자리는 None
+    """
+    if not user_data_list:
+        return []
+    max_concurrency = max_concurrency or getattr(settings, "ANALYZER_MAX_CONCURRENCY", 8)
+    call_timeout = call_timeout or getattr(settings, "ANALYZER_CALL_TIMEOUT", 60)
+    chunk_size = chunk_size or getattr(settings, "ANALYZER_APPLICANT_BATCH_SIZE", 1)
+    return asyncio.run(_analyze_applicants_async(notice_data, user_data_list, max_concurrency, call_timeout, chunk_size))
+
+# --- [8. 전체 공고 순회부] ---
 
 def process_all_notices(user_data: Dict[str, Any], all_notices: List[Dict[str, Any]]):
-    priority_info = {}
-    for notice in all_notices:
-        notice_id = str(notice.get("id") or notice.get("announcement_id"))
-        result = analyze_eligibility_with_ai(user_data, notice)
-        priority_info[notice_id] = result
+    notices = {
+        str(notice.get("id") or notice.get("announcement_id")): notice
+        for notice in all_notices
+    }
+    priority_info = analyze_notices_concurrently(user_data, notices)
+
+    return { "success": True, "profile": { **user_data, "priority_info": priority_info } }
+
+# --- [9. 배치 파일 (OpenAI Batch API JSONL) 입출력] ---
+
+BATCH_CUSTOM_ID_PATTERN = re.compile(r'^ann(\d+)-user(\d+)-fp([0-9a-f]+)$')
 
-    return { "success": True, "profile": { **user_data, "priority_info": priority_info } }
\ No newline at end of file
+def batch_custom_id(announcement_id: int, user_id: int, fingerprint: str) -> str:
+    """배치 요청 ID (같은 대상이면 항상 같은 ID → 내보내기/적재를 이어서 할 수 있음)"""
+    return f"ann{announcement_id}-user{user_id}-fp{fingerprint}"
+
+def parse_batch_custom_id(custom_id: str) -> Optional[Tuple[int, int, str]]:
+    match = BATCH_CUSTOM_ID_PATTERN.match(custom_id or "")
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2)), match.group(3)
+
+def build_batch_request(custom_id: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    """요청 파일 1줄"""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": _chat_kwargs(messages),
+    }
+
+def parse_batch_result(line: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """결과 파일 1줄 → 검증된 판정 결과, 오류/형식 불일치면 None"""
+    response = line.get("response") or {}
+    if line.get("error") or response.get("status_code") != 200:
+        return None
+    try:
+        content = response["body"]["choices"][0]["message"]["content"]
+        verdict = json.loads(content)
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+    if not is_valid_verdict(verdict):
+        return None
+    return finalize_ai_result(verdict)
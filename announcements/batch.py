@@ -0,0 +1,110 @@
+# announcements/batch.py
+"""
+야간 일괄 재분석용 배치 파일 파이프라인 (OpenAI Batch API JSONL)
+- export_analysis_batch: 결과가 없거나 stale인 (사용자 × 공고) 중 LLM이 필요한 판정만 요청 파일로
+- ingest_analysis_batch: 결과 파일을 검증해서 EligibilityVerdict / HousingEligibilityAnalysis에 일괄 저장
+규칙 판정과 이미 알고 있는 지문은 두 명령 모두 파일 없이 바로 저장 (settle_pending_pairs)
+"""
+import logging
+from django.conf import settings
+from announcements.models import Announcement, EligibilityVerdict, HousingEligibilityAnalysis
+from profiles.models import Profile
+from profiles.tasks import ANALYSIS_STATUSES, merge_priority_info, profile_to_user_data
+import analyzer
+
+logger = logging.getLogger(__name__)
+
+
+def iter_profile_chunks(chunk_size: int):
+    chunk = []
+    for profile in Profile.objects.order_by('id').iterator(chunk_size=chunk_size):
+        chunk.append(profile)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def mark_all_stale(statuses=None) -> int:
+    """전체 재분석: 대상 공고의 기존 결과를 모두 stale로 표시"""
+    return HousingEligibilityAnalysis.objects.filter(
+        announcement__status__in=statuses or ANALYSIS_STATUSES
+    ).update(is_stale=True)
+
+
+def _save_chunk(results: dict, new_verdicts: list) -> None:
+    """{(user_id, 공고ID): 결과} 저장 + 프로필 요약(priority_info) 병합"""
+    EligibilityVerdict.objects.bulk_create(new_verdicts, ignore_conflicts=True)
+    HousingEligibilityAnalysis.objects.bulk_upsert(
+        HousingEligibilityAnalysis.objects.from_result(user_id, ann_id, result)
+        for (user_id, ann_id), result in results.items()
+    )
+
+    by_user = {}
+    for (user_id, ann_id), result in results.items():
+        by_user.setdefault(user_id, {})[str(ann_id)] = result
+    merge_priority_info(by_user)
+
+
+def settle_pending_pairs(statuses=None, on_unresolved=None) -> dict:
+    """
+    결과가 없거나 stale인 (사용자 × 공고)를 순회하며 LLM 없이 끝나는 판정을 저장
+    - 이미 있는 지문 판정(EligibilityVerdict) 복사, 규칙 판정/판정 캐시는 바로 저장
+    - 나머지는 on_unresolved(announcement_id, user_id, fingerprint, messages) 호출 (요청 파일 쓰기 등)
+    """
+    announcements = [
+        (ann.id, ann.notice_data())
+        for ann in Announcement.objects.select_related('summary').filter(
+            status__in=statuses or ANALYSIS_STATUSES
+        ).order_by('id')
+    ]
+    announcements = [(ann_id, notice) for ann_id, notice in announcements if notice]
+    counts = {"pending": 0, "settled": 0, "unresolved": 0}
+
+    for profiles in iter_profile_chunks(settings.ANALYSIS_BATCH_PROFILE_CHUNK_SIZE):
+        user_ids = [p.user_id for p in profiles]
+        fresh = set(
+            HousingEligibilityAnalysis.objects.filter(user_id__in=user_ids, is_stale=False)
+            .values_list('user_id', 'announcement_id')
+        )
+
+        pending = {}
+        for profile in profiles:
+            user_data = profile_to_user_data(profile)
+            for ann_id, notice in announcements:
+                if (profile.user_id, ann_id) in fresh:
+                    continue
+                fp = analyzer.eligibility_fingerprint(user_data, notice)
+                pending[(profile.user_id, ann_id)] = (fp, user_data, notice)
+        counts["pending"] += len(pending)
+
+        known = {
+            v.fingerprint: v.to_result()
+            for v in EligibilityVerdict.objects.filter(fingerprint__in={fp for fp, _, _ in pending.values()})
+        }
+        results, new_verdicts = {}, []
+        for (user_id, ann_id), (fp, user_data, notice) in pending.items():
+            if fp in known:
+                results[(user_id, ann_id)] = known[fp]
+                continue
+            settled, pending_verdict = analyzer.resolve_verdict(user_data, notice)
+            if settled is not None:
+                known[fp] = settled
+                results[(user_id, ann_id)] = settled
+                new_verdicts.append(EligibilityVerdict(
+                    fingerprint=fp,
+                    announcement_id=ann_id,
+                    is_eligible=settled.get("is_eligible", False),
+                    priority=settled.get("priority", ""),
+                    reasons=settled.get("reasons", []),
+                    decided_by=settled.get("decided_by", analyzer.DECIDED_BY_LLM),
+                ))
+                continue
+            counts["unresolved"] += 1
+            if on_unresolved is not None:
+                on_unresolved(ann_id, user_id, fp, pending_verdict.messages)
+
+        _save_chunk(results, new_verdicts)
+        counts["settled"] += len(results)
+    return counts
@@ -0,0 +1,91 @@
+# announcements/caching.py
+"""
+공고 목록 캐시
+- 공개 목록(id, 제목, 게시일, 상태, 카테고리)은 사용자와 무관 → 카탈로그 버전 키 아래 조회 조건별로 공유
+  공고 내용/상태가 바뀌면 bump_catalog_version()으로 버전만 올려서 이전 캐시를 한 번에 무효화
+- 사용자별 자격 결과({공고ID: {is_eligible, priority}})는 작은 맵으로 따로 캐시해서 응답 시 합침
+  분석 결과 저장(HousingEligibilityAnalysisManager.bulk_upsert) 시 해당 사용자 맵 삭제
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = "announcements:catalog_version"
+
+
+def catalog_version() -> int:
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # 키가 사라졌을 때 예전 버전 번호를 다시 쓰지 않도록 현재 시각으로 시작
+        cache.add(CATALOG_VERSION_KEY, int(time.time()), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version() -> None:
+    """공고 추가/수정/상태 변경 후 호출: 공개 목록 캐시 전체 무효화"""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, int(time.time()), None)
+
+
+def _list_page_key(params: dict) -> str:
+    signature = hashlib.sha1(urlencode(sorted(params.items())).encode('utf-8')).hexdigest()
+    return f"announcements:list:{catalog_version()}:{signature}"
+
+
+def get_or_build_list_page(params: dict, build):
+    """
+    조회 조건(params)별 공개 목록 캐시, 없으면 build()로 만들어 저장
+    캐시가 비었을 때 동시에 들어온 요청은 한 곳에서만 만들고 나머지는 잠깐 기다림 (대기 초과 시 직접 생성)
+    """
+    key = _list_page_key(params)
+    page = cache.get(key)
+    if page is not None:
+        return page
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, settings.ANNOUNCEMENT_LIST_LOCK_TTL):
+        try:
+            page = build()
+            cache.set(key, page, settings.CACHE_TTL)
+            return page
+        finally:
+            cache.delete(lock_key)
+
+    waited = 0.0
+    while waited < settings.ANNOUNCEMENT_LIST_LOCK_WAIT:
+        time.sleep(0.05)
+        waited += 0.05
+        page = cache.get(key)
+        if page is not None:
+            return page
+    return build()
+
+
+def user_overlay_key(user_id: int) -> str:
+    return f"announcements:overlay:{user_id}"
+
+
+def get_user_overlay(user_id: int) -> dict:
+    """사용자의 {공고ID: {'is_eligible', 'priority'}} (목록 응답의 analysis)"""
+    from .models import HousingEligibilityAnalysis
+
+    key = user_overlay_key(user_id)
+    overlay = cache.get(key)
+    if overlay is None:
+        overlay = {
+            ann_id: {'is_eligible': is_eligible, 'priority': priority}
+            for ann_id, is_eligible, priority in HousingEligibilityAnalysis.objects.filter(
+                user_id=user_id
+            ).values_list('announcement_id', 'is_eligible', 'priority')
+        }
+        cache.set(key, overlay, settings.CACHE_TTL)
+    return overlay
+
+
+def invalidate_user_overlays(user_ids) -> None:
+    cache.delete_many([user_overlay_key(user_id) for user_id in set(user_ids)])
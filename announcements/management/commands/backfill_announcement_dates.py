@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from announcements.caching import bump_catalog_version
+from announcements.models import Announcement
+from announcements.tasks import announcement_dates_from_summary
+
+
+class Command(BaseCommand):
+    help = "기존 공고의 AI 요약에서 게시일/신청 시작일/신청 마감일(posted_date, application_start, application_end) 채우기"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="이미 날짜가 있는 공고도 다시 파싱")
+        parser.add_argument("--batch-size", type=int, default=200, help="한 번에 저장하는 공고 수")
+
+    def handle(self, *args, **options):
+        announcements = Announcement.objects.select_related('summary').exclude(summary__isnull=True)
+        if not options["all"]:
+            announcements = announcements.filter(posted_date__isnull=True)
+
+        pending = []
+        updated = 0
+        missing = 0
+        for ann in announcements.iterator(chunk_size=options["batch_size"]):
+            ann.posted_date, ann.application_start, ann.application_end = announcement_dates_from_summary(
+                ann.ai_summary_json
+            )
+            if not (ann.posted_date and ann.application_start and ann.application_end):
+                missing += 1
+            pending.append(ann)
+            if len(pending) >= options["batch_size"]:
+                updated += Announcement.objects.bulk_update(
+                    pending, ["posted_date", "application_start", "application_end"]
+                )
+                pending = []
+        if pending:
+            updated += Announcement.objects.bulk_update(
+                pending, ["posted_date", "application_start", "application_end"]
+            )
+
+        # 목록 정렬 기준이 바뀌므로 공고 목록 캐시 무효화
+        if updated:
+            bump_catalog_version()
+
+        self.stdout.write(self.style.SUCCESS(f"Updated: {updated} rows."))
+        if missing:
+            self.stdout.write(self.style.WARNING(f"Unparsed date(s): {missing} rows."))
@@ -0,0 +1,142 @@
+import json
+import os
+import random
+import statistics
+import time
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+import analyzer
+
+
+# 벤치마크 동안만 쓰는 로컬 캐시 (실행마다 판정 캐시가 비어 있는 상태에서 측정)
+BENCHMARK_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "benchmark-analyzer",
+    }
+}
+
+STAT_NAMES = ["llm_call", "verdict_cache_hit", "verdict_cache_miss"]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = "임시 테스트 DB에 공고 N건 × 가상 프로필 M명을 만들고 analyze_user_eligibility_task 처리량 측정"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--announcements", type=int, default=20, help="extracted_json/에서 불러올 공고 수")
+        parser.add_argument("--profiles", type=int, default=10, help="가상 프로필 수")
+        parser.add_argument("--source", type=str, default="extracted_json", help="공고 JSON 폴더")
+        parser.add_argument("--base-url", type=str, default="http://127.0.0.1:8765/v1",
+                            help="OpenAI 호환 서버 주소 (scripts/fake_llm_server.py)")
+        parser.add_argument("--seed", type=int, default=0, help="가상 프로필 난수 시드")
+        parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+
+    def seed_announcements(self, source, count):
+        from announcements.models import Announcement
+
+        files = sorted(f for f in os.listdir(source) if f.endswith(".json"))[:count]
+        for name in files:
+            call_command("import_ai_summary", os.path.join(source, name), no_analyze=True, stdout=StringIO())
+        # 상태와 무관하게 모든 공고를 분석 대상으로
+        Announcement.objects.update(status="open")
+        return Announcement.objects.count()
+
+    def seed_profiles(self, count, seed):
+        from profiles.models import Profile
+        from users.models import User
+
+        rng = random.Random(seed)
+        user_ids = []
+        for i in range(count):
+            user = User.objects.create(email=f"bench{i}@example.com", nickname=f"bench{i}")
+            Profile.objects.create(
+                user=user,
+                birth_date=f"{rng.randint(85, 99)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+                gender=rng.choice(["M", "F"]),
+                university=rng.random() < 0.5,
+                graduate=rng.random() < 0.3,
+                employed=rng.random() < 0.5,
+                job_seeker=rng.random() < 0.3,
+                is_married=rng.choice(["single", "new", "married"]),
+                residence="서울",
+                welfare_receipient=rng.random() < 0.1,
+                parents_own_house=rng.random() < 0.4,
+                disability_in_family=rng.random() < 0.1,
+                subscription_account=rng.randint(0, 60),
+                total_assets=rng.randint(0, 40) * 10_000_000,
+                car_value=rng.choice([0, 0, 15_000_000, 40_000_000]),
+                income_range=rng.choice(["100% 이하", "50% 이하"]),
+            )
+            user_ids.append(user.id)
+        return user_ids
+
+    def run_benchmark(self, options):
+        from celery import current_app
+        from profiles.tasks import analyze_user_eligibility_task
+
+        # chord로 나뉜 청크/콜백까지 현재 프로세스에서 실행
+        current_app.conf.task_always_eager = True
+
+        notice_count = self.seed_announcements(options["source"], options["announcements"])
+        user_ids = self.seed_profiles(options["profiles"], options["seed"])
+        before = analyzer.get_stats(STAT_NAMES)
+
+        latencies = []
+        started = time.perf_counter()
+        for user_id in user_ids:
+            task_start = time.perf_counter()
+            analyze_user_eligibility_task.apply(args=[user_id])
+            latencies.append(time.perf_counter() - task_start)
+        elapsed = time.perf_counter() - started
+
+        after = analyzer.get_stats(STAT_NAMES)
+        pairs = notice_count * len(user_ids)
+        return {
+            "announcements": notice_count,
+            "profiles": len(user_ids),
+            "pairs": pairs,
+            "elapsed_sec": round(elapsed, 3),
+            "pairs_per_sec": round(pairs / elapsed, 2) if elapsed else 0.0,
+            "task_p50_sec": round(statistics.median(latencies), 3) if latencies else 0.0,
+            "task_p95_sec": round(percentile(latencies, 95), 3),
+            **{name: after[name] - before[name] for name in STAT_NAMES},
+        }
+
+    def handle(self, *args, **options):
+        # 가짜 서버는 키를 검사하지 않지만 클라이언트 생성에는 필요
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES, OPENAI_BASE_URL=options["base_url"]):
+                analyzer.reset_openai_client()
+                result = self.run_benchmark(options)
+        finally:
+            analyzer.reset_openai_client()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, ensure_ascii=False))
+            return
+        self.stdout.write(
+            f"공고 {result['announcements']}건 × 프로필 {result['profiles']}명 = {result['pairs']}쌍"
+        )
+        self.stdout.write(
+            f"처리량: {result['pairs_per_sec']} pairs/sec (총 {result['elapsed_sec']}s)"
+        )
+        self.stdout.write(f"작업 지연: p50={result['task_p50_sec']}s p95={result['task_p95_sec']}s")
+        self.stdout.write(self.style.SUCCESS(
+            f"LLM 호출 {result['llm_call']}회 "
+            f"(판정 캐시 hit {result['verdict_cache_hit']} / miss {result['verdict_cache_miss']})"
+        ))
@@ -0,0 +1,52 @@
+import os
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from openai import OpenAI
+import analyzer
+
+
+class Command(BaseCommand):
+    help = "호출마다 새 OpenAI 클라이언트를 만드는 방식과 재사용 클라이언트의 호출당 오버헤드 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", type=str, default="http://127.0.0.1:8765/v1",
+                            help="OpenAI 호환 서버 주소 (scripts/fake_llm_server.py)")
+        parser.add_argument("--calls", type=int, default=50, help="방식별 호출 수")
+
+    def _measure(self, make_client, messages, calls):
+        timings = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            analyzer.request_json(messages, client=make_client())
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def handle(self, *args, **options):
+        base_url = options["base_url"]
+        # 가짜 서버는 키를 검사하지 않지만 클라이언트 생성에는 필요
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        calls = options["calls"]
+        messages = [
+            {"role": "system", "content": analyzer.SYSTEM_PROMPT},
+            {"role": "user", "content": "벤치마크 요청"},
+        ]
+
+        # 기존 방식: 호출마다 클라이언트 생성 (연결/TLS 매번 새로)
+        fresh = self._measure(
+            lambda: OpenAI(base_url=base_url),
+            messages, calls
+        )
+
+        # 재사용 방식: keep-alive 연결 풀을 가진 클라이언트 1개
+        pooled_client = analyzer.build_openai_client(base_url=base_url)
+        pooled = self._measure(lambda: pooled_client, messages, calls)
+        pooled_client.close()
+
+        for name, timings in [("fresh client", fresh), ("pooled client", pooled)]:
+            self.stdout.write(
+                f"{name:>14}: mean={statistics.mean(timings):.1f}ms "
+                f"p50={statistics.median(timings):.1f}ms max={max(timings):.1f}ms"
+            )
+        saved = statistics.mean(fresh) - statistics.mean(pooled)
+        self.stdout.write(self.style.SUCCESS(f"호출당 절감: {saved:.1f}ms ({calls}회 기준)"))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from announcements.models import Announcement, HousingEligibilityAnalysis
+import analyzer
+
+
+class Command(BaseCommand):
+    help = "기존 공고의 AI 요약(AnnouncementSummary)에서 구조화된 자격 조건(eligibility_criteria)과 criteria_hash를 다시 생성"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="이미 최신 형식인 공고도 다시 컴파일")
+
+    def handle(self, *args, **options):
+        updated = 0
+        skipped = 0
+        stale = 0
+
+        for ann in Announcement.objects.select_related('summary').exclude(summary__ai_summary_json__isnull=True).iterator():
+            criteria = ann.eligibility_criteria or {}
+            if not options["all"] and criteria.get("version") == analyzer.CRITERIA_VERSION and ann.criteria_hash:
+                skipped += 1
+                continue
+
+            compiled = analyzer.compile_notice_criteria(ann.ai_summary_json)
+            if {**compiled, "version": None} != {**criteria, "version": None}:
+                # 규칙 판정 기준이 바뀌었으면 이전 조건으로 규칙 탈락시킨 결과는 다시 분석
+                stale += HousingEligibilityAnalysis.objects.filter(
+                    announcement=ann, decided_by=analyzer.DECIDED_BY_RULE
+                ).update(is_stale=True)
+            ann.eligibility_criteria = compiled
+            # 해시가 비어 있으면 다음 import 때 변경으로 간주되므로 현재 내용 기준으로 채워 둠
+            ann.criteria_hash = analyzer.notice_criteria_hash(ann.ai_summary_json)
+            ann.save(update_fields=["eligibility_criteria", "criteria_hash"])
+            updated += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Compiled: {updated} rows."))
+        self.stdout.write(self.style.WARNING(f"Skipped: {skipped} rows."))
+        if stale:
+            self.stdout.write(self.style.WARNING(f"Marked stale (rule verdicts): {stale} rows."))
@@ -0,0 +1,71 @@
+import json
+import os
+from django.core.management.base import BaseCommand
+from announcements.batch import mark_all_stale, settle_pending_pairs
+import analyzer
+
+
+class Command(BaseCommand):
+    help = "결과가 없거나 stale인 (사용자 × 공고) 판정 중 LLM이 필요한 것만 OpenAI Batch 요청 파일(JSONL)로 내보냄"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", type=str, help="요청 JSONL 파일 경로 (이미 있으면 이어서 씀)")
+        parser.add_argument("--all", action="store_true", help="기존 결과를 모두 stale로 표시하고 전체 재분석")
+        parser.add_argument(
+            "--retry-failed", action="append", default=[], metavar="FAILED_FILE",
+            help="ingest_analysis_batch가 기록한 실패 custom_id 파일: 이미 내보낸 요청이라도 다시 씀 (여러 번 지정 가능)"
+        )
+        parser.add_argument("--limit", type=int, default=50000, help="이번 실행에서 새로 쓰는 최대 요청 수 (Batch API 파일당 한도, 이어 쓸 때는 기존 줄 제외)")
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        limit = options["limit"]
+
+        # 이어서 쓰기: 이미 내보낸 지문은 다시 쓰지 않음
+        exported = set()
+        if os.path.exists(output):
+            with open(output, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        parsed = analyzer.parse_batch_custom_id(json.loads(line).get("custom_id"))
+                        if parsed:
+                            exported.add(parsed[2])
+            self.stdout.write(f"기존 요청 {len(exported)}건 이후부터 이어서 씀")
+
+        # 결과가 실패로 돌아온 요청은 다시 써야 하므로 이어 쓰기 중복 제외 대상에서 뺌
+        retry = set()
+        for failed_path in options["retry_failed"]:
+            with open(failed_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parsed = analyzer.parse_batch_custom_id(line.strip())
+                    if parsed:
+                        retry.add(parsed[2])
+        if retry:
+            exported -= retry
+            self.stdout.write(f"실패한 요청 {len(retry)}건 다시 씀")
+
+        if options["all"]:
+            self.stdout.write(f"기존 결과 {mark_all_stale()}건 stale 표시")
+
+        written = 0
+        with open(output, "a", encoding="utf-8") as f:
+            def write_request(announcement_id, user_id, fingerprint, messages):
+                nonlocal written
+                # 같은 지문은 요청 1건이면 충분 (나머지 사용자는 적재 후 복사)
+                if fingerprint in exported or written >= limit:
+                    return
+                custom_id = analyzer.batch_custom_id(announcement_id, user_id, fingerprint)
+                f.write(json.dumps(analyzer.build_batch_request(custom_id, messages), ensure_ascii=False) + "\n")
+                exported.add(fingerprint)
+                written += 1
+
+            counts = settle_pending_pairs(on_unresolved=write_request)
+
+        self.stdout.write(
+            f"대상 {counts['pending']}쌍: 바로 저장 {counts['settled']}쌍 / LLM 필요 {counts['unresolved']}쌍"
+        )
+        self.stdout.write(self.style.SUCCESS(f"요청 {written}건 기록 → {output} (총 {len(exported)}건)"))
+        if written >= limit:
+            self.stdout.write(self.style.WARNING(
+                f"이번 실행 요청 수가 --limit({limit})에 도달: 나머지는 다시 실행해서 이어 쓰거나 새 파일로 내보내세요."
+            ))
@@ -3,14 +3,20 @@ import json
 import os
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from announcements.models import Announcement, HousingInfo
+from announcements.caching import bump_catalog_version
+from announcements.models import Announcement, AnnouncementSummary, HousingInfo, HousingEligibilityAnalysis
+from announcements.tasks import analyze_announcement_for_all_users_task, announcement_dates_from_summary
+from profiles.tasks import ANALYSIS_STATUSES
+import analyzer
 
 
 class Command(BaseCommand):
-    help = 'AI가 생성한 JSON 파일을 ai_summary_json 필드에 저장하고, HousingInfo는 DB에 생성'
+    help = 'AI가 생성한 JSON 파일을 AnnouncementSummary에 저장하고, HousingInfo는 DB에 생성'
 
     def add_arguments(self, parser):
         parser.add_argument('path', type=str, help="JSON 파일 또는 JSON 폴더 경로")
+        parser.add_argument('--no-analyze', action='store_true',
+                            help="import 후 전체 사용자 자격 분석(백필) 작업을 등록하지 않음")
 
     def normalize_list_field(self, value, field_name="field"):
         """
@@ -154,7 +160,7 @@ class Command(BaseCommand):
                 continue
 
             try:
-                announcement = Announcement.objects.get(id=announcement_id)
+                announcement = Announcement.objects.select_related('summary').get(id=announcement_id)
                 self.stdout.write(f"✓ 기존 Announcement({announcement_id}) 업데이트")
             except Announcement.DoesNotExist:
                 announcement = Announcement(id=announcement_id)
@@ -165,15 +171,37 @@ class Command(BaseCommand):
                     # ai_summary_json에 housing_info 제외하고 저장
                     ai_summary_copy = dict(data)
                     ai_summary_copy.pop("housing_info", None)
-                    announcement.ai_summary_json = ai_summary_copy
+                    # 자격 요건은 import 시 한 번만 파싱해서 저장
+                    announcement.eligibility_criteria = analyzer.compile_notice_criteria(ai_summary_copy)
+                    # 자격 요건/순위 기준이 바뀐 공고만 재분석 (제목 등 수정은 LLM 호출 없음)
+                    criteria_hash = analyzer.notice_criteria_hash(ai_summary_copy)
+                    criteria_changed = announcement.criteria_hash != criteria_hash
+                    announcement.criteria_hash = criteria_hash
 
                     # 기본 필드들
                     schedule = data.get("application_schedule", {})
                     announcement.announcement_date = schedule.get("announcement_date", "")
                     announcement.title = data.get("title", "")
                     announcement.status = data.get("status", "closed")
+                    # 목록용 컬럼 (게시일 표시 형식, 카테고리)
+                    announcement.sync_summary_columns(ai_summary_copy)
+                    # 정렬/상태 계산용 날짜
+                    (announcement.posted_date,
+                     announcement.application_start,
+                     announcement.application_end) = announcement_dates_from_summary(ai_summary_copy)
                     
                     announcement.save()
+                    announcement.sync_categories()
+                    AnnouncementSummary.objects.update_or_create(
+                        announcement=announcement, defaults={'ai_summary_json': ai_summary_copy}
+                    )
+
+                    if criteria_changed:
+                        stale_count = HousingEligibilityAnalysis.objects.filter(
+                            announcement=announcement
+                        ).update(is_stale=True)
+                        if stale_count:
+                            self.stdout.write(f"  - 자격 요건 변경: 기존 분석 {stale_count}건 재분석 대상으로 표시")
                     
                     # 기존 HousingInfo 삭제 (전체 교체 방식)
                     deleted_count = HousingInfo.objects.filter(announcement=announcement).count()
@@ -206,11 +234,22 @@ class Command(BaseCommand):
 
                 success_count += 1
 
+                # 새 공고 / 자격 요건이 바뀐 공고는 모든 사용자에 대해 이 공고만 분석
+                if not criteria_changed:
+                    self.stdout.write(f"  - 자격 요건 변경 없음 → 재분석 생략")
+                elif not options['no_analyze'] and announcement.status in ANALYSIS_STATUSES:
+                    analyze_announcement_for_all_users_task.delay(announcement.id)
+                    self.stdout.write(f"  - 전체 사용자 자격 분석 작업 등록")
+
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f"처리 중 오류: {e}"))
                 error_count += 1
                 continue
 
+        # 공고 목록 캐시 무효화
+        if success_count:
+            bump_catalog_version()
+
         self.stdout.write(f"\n{'='*60}")
         self.stdout.write(self.style.SUCCESS(f"✓ 성공: {success_count}개"))
         if error_count > 0:
@@ -0,0 +1,92 @@
+import json
+import os
+from django.core.management.base import BaseCommand
+from announcements.batch import settle_pending_pairs
+from announcements.models import EligibilityVerdict
+import analyzer
+
+
+class Command(BaseCommand):
+    help = "OpenAI Batch 결과 파일(JSONL)을 검증해서 자격 판정을 일괄 저장 (같은 지문의 사용자에게도 복사)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("results", type=str, help="결과 JSONL 파일 경로")
+        parser.add_argument("--batch-size", type=int, default=500, help="한 번에 저장하는 판정 수")
+        parser.add_argument("--restart", action="store_true", help="진행 기록을 무시하고 처음부터 다시 적재")
+        parser.add_argument(
+            "--failed-output", type=str, default=None,
+            help="실패한 요청 custom_id 목록 파일 (기본: <결과 파일>.failed, export_analysis_batch --retry-failed로 다시 내보냄)"
+        )
+
+    def _flush(self, verdicts, progress_path, line_no):
+        EligibilityVerdict.objects.bulk_create(verdicts, ignore_conflicts=True)
+        # 저장이 끝난 줄 번호 기록 (중단 후 다시 실행하면 여기부터)
+        with open(progress_path, "w", encoding="utf-8") as f:
+            f.write(str(line_no))
+
+    def handle(self, *args, **options):
+        results_path = options["results"]
+        progress_path = results_path + ".progress"
+        failed_path = options["failed_output"] or results_path + ".failed"
+        start = 0
+        if os.path.exists(progress_path) and not options["restart"]:
+            with open(progress_path, "r", encoding="utf-8") as f:
+                start = int(f.read().strip() or 0)
+            self.stdout.write(f"{start}번째 줄 이후부터 이어서 적재")
+
+        counts = {"ingested": 0, "invalid": 0}
+        verdicts = []
+        failed_ids = []
+        line_no = start
+        with open(results_path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if line_no <= start or not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    counts["invalid"] += 1
+                    continue
+
+                parsed = analyzer.parse_batch_custom_id(row.get("custom_id"))
+                result = analyzer.parse_batch_result(row)
+                if parsed is None or result is None:
+                    counts["invalid"] += 1
+                    self.stdout.write(self.style.WARNING(f"  - 검증 실패: {row.get('custom_id')}"))
+                    if parsed is not None:
+                        failed_ids.append(row["custom_id"])
+                    continue
+
+                announcement_id, _, fingerprint = parsed
+                verdicts.append(EligibilityVerdict(
+                    fingerprint=fingerprint,
+                    announcement_id=announcement_id,
+                    is_eligible=result["is_eligible"],
+                    priority=result["priority"],
+                    reasons=result["reasons"],
+                    decided_by=result["decided_by"],
+                ))
+                counts["ingested"] += 1
+                if len(verdicts) >= options["batch_size"]:
+                    self._flush(verdicts, progress_path, line_no)
+                    verdicts = []
+        self._flush(verdicts, progress_path, line_no)
+
+        self.stdout.write(f"판정 {counts['ingested']}건 적재 / 검증 실패 {counts['invalid']}건")
+
+        # 실패한 요청은 같은 요청 파일에 이어 쓸 때 이미 내보낸 것으로 보고 건너뛰므로 따로 기록
+        # (이어서 적재한 실행이면 이전 실행의 기록 뒤에 추가)
+        with open(failed_path, "a" if start else "w", encoding="utf-8") as f:
+            for custom_id in failed_ids:
+                f.write(custom_id + "\n")
+        if failed_ids:
+            self.stdout.write(self.style.WARNING(
+                f"실패한 요청 {len(failed_ids)}건 → {failed_path}: "
+                f"export_analysis_batch --retry-failed {failed_path} 로 다시 내보내야 분석됩니다."
+            ))
+
+        # 적재한 지문으로 대기 중인 (사용자 × 공고) 결과 채우기
+        settled = settle_pending_pairs()
+        self.stdout.write(self.style.SUCCESS(
+            f"결과 저장 {settled['settled']}쌍 / 아직 판정 없음 {settled['unresolved']}쌍"
+        ))
@@ -1,5 +1,6 @@
 import json
 from django.core.management.base import BaseCommand
+from announcements.caching import bump_catalog_version
 from announcements.models import Announcement
 
 class Command(BaseCommand):
@@ -47,6 +48,10 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.ERROR(f"ID {ann_id} not found"))
                 missing += 1
 
+        # 공고 목록 캐시 무효화
+        if updated:
+            bump_catalog_version()
+
         self.stdout.write(self.style.SUCCESS(f"Updated: {updated} rows."))
         self.stdout.write(self.style.WARNING(f"Skipped: {skipped} rows."))
         self.stdout.write(self.style.ERROR(f"Missing: {missing} rows."))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0014_alter_housinginfo_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='housingeligibilityanalysis',
+            name='decided_by',
+            field=models.CharField(choices=[('rule', '규칙 판정'), ('llm', 'AI 판정')], default='llm', max_length=10),
+        ),
+    ]
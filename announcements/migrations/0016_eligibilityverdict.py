@@ -0,0 +1,27 @@
+# Generated by Django 4.2.20 on 2026-10-18 10:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0015_housingeligibilityanalysis_decided_by'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EligibilityVerdict',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=64, unique=True)),
+                ('is_eligible', models.BooleanField(default=False)),
+                ('priority', models.CharField(default='', max_length=100)),
+                ('reasons', models.JSONField(default=list)),
+                ('decided_by', models.CharField(choices=[('rule', '규칙 판정'), ('llm', 'AI 판정')], default='llm', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligibility_verdicts', to='announcements.announcement')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0016_eligibilityverdict'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='eligibility_criteria',
+            field=models.JSONField(blank=True, help_text='import 시 자격 요건 텍스트를 미리 파싱한 구조화 조건 (analyzer.compile_notice_criteria)', null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0017_announcement_eligibility_criteria'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='criteria_hash',
+            field=models.CharField(blank=True, default='', help_text='자격 판정에 쓰이는 부분의 해시 (analyzer.notice_criteria_hash), 바뀌면 재분석', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='housingeligibilityanalysis',
+            name='is_stale',
+            field=models.BooleanField(default=False),
+        ),
+    ]
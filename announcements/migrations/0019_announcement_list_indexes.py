@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-18 13:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0018_announcement_criteria_hash_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['status', 'announcement_date', 'id'], name='announcemen_status_c739c3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='housinginfo',
+            index=models.Index(fields=['district', 'announcement'], name='announcemen_distric_a57c0e_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def move_summary_json(apps, schema_editor):
+    """ai_summary_json → AnnouncementSummary, 목록용 컬럼(게시일 표시 형식, 카테고리) 채우기"""
+    Announcement = apps.get_model('announcements', 'Announcement')
+    AnnouncementSummary = apps.get_model('announcements', 'AnnouncementSummary')
+
+    summaries = []
+    for ann in Announcement.objects.exclude(ai_summary_json__isnull=True).iterator():
+        summary = ann.ai_summary_json
+        summaries.append(AnnouncementSummary(announcement_id=ann.id, ai_summary_json=summary))
+
+        schedule = summary.get('application_schedule') or {}
+        posted_raw = schedule.get('announcement_date')
+        if posted_raw and '미정' not in posted_raw:
+            ann.announcement_date = posted_raw.replace('-', '.')
+        ann.category_user = summary.get('category_user') or []
+        ann.category_type = summary.get('category_type') or []
+        ann.save(update_fields=['announcement_date', 'category_user', 'category_type'])
+    AnnouncementSummary.objects.bulk_create(summaries, batch_size=200)
+
+
+def restore_summary_json(apps, schema_editor):
+    Announcement = apps.get_model('announcements', 'Announcement')
+    AnnouncementSummary = apps.get_model('announcements', 'AnnouncementSummary')
+
+    for summary in AnnouncementSummary.objects.iterator():
+        Announcement.objects.filter(id=summary.announcement_id).update(ai_summary_json=summary.ai_summary_json)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0019_announcement_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementSummary',
+            fields=[
+                ('announcement', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='announcements.announcement')),
+                ('ai_summary_json', models.JSONField(blank=True, help_text='AI가 PDF에서 추출한 요약 JSON 데이터', null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='category_user',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='category_type',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(move_summary_json, restore_summary_json),
+        migrations.RemoveField(
+            model_name='announcement',
+            name='ai_summary_json',
+        ),
+    ]
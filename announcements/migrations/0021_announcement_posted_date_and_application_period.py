@@ -0,0 +1,40 @@
+# Generated by Django 4.2.20 on 2026-10-18 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0020_announcementsummary_and_list_columns'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='announcement',
+            name='announcemen_status_c739c3_idx',
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='application_end',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='application_start',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='posted_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['status', 'posted_date', 'id'], name='announcemen_status_3a7f1c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['posted_date', 'id'], name='announcemen_posted__d2c837_idx'),
+        ),
+    ]
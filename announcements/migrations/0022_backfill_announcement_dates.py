@@ -0,0 +1,95 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:20
+
+import re
+from datetime import date, datetime
+
+from django.db import migrations
+
+
+# 마이그레이션 작성 시점의 announcements.tasks 날짜 파서 사본 (이후 코드가 바뀌어도 결과가 달라지지 않도록 고정)
+
+def parse_ymd(s):
+    if not s or '미정' in s:
+        return None
+    try:
+        s = re.sub(r'\([^)]*\)', '', s)
+        s = re.sub(r'\s*\d{1,2}:\d{2}.*$', '', s)
+        s = s.strip().rstrip('.')
+        if not s:
+            return None
+        s = s.replace('-', '.')
+        for fmt in ['%Y.%m.%d', '%Y.%-m.%-d', '%Y.%m.%d.']:
+            try:
+                return datetime.strptime(s, fmt).date()
+            except (ValueError, AttributeError):
+                continue
+        parts = s.split('.')
+        if len(parts) >= 3:
+            return date(int(parts[0]), int(parts[1]), int(parts[2]))
+        return None
+    except (ValueError, TypeError, IndexError):
+        return None
+
+
+def parse_period(s):
+    if not s or '미정' in s or '상시' in s:
+        return None, None
+    try:
+        parts = s.split('~')
+        if len(parts) == 1:
+            single_date = parse_ymd(parts[0].strip())
+            return single_date, single_date
+        if len(parts) != 2:
+            return None, None
+
+        start_raw = parts[0].strip()
+        end_raw = parts[1].strip()
+        start = parse_ymd(start_raw)
+        # 종료일에 연도가 없으면 시작일의 연도 사용
+        if start and end_raw and not re.match(r'\d{4}', end_raw):
+            end_raw_cleaned = re.sub(r'\([^)]*\)', '', end_raw)
+            end_raw_cleaned = re.sub(r'\s*\d{1,2}:\d{2}.*$', '', end_raw_cleaned)
+            parts_end = end_raw_cleaned.strip().rstrip('.').split('.')
+            if len(parts_end) >= 2:
+                end = date(start.year, int(parts_end[0]), int(parts_end[1]))
+            else:
+                end = parse_ymd(end_raw)
+        else:
+            end = parse_ymd(end_raw)
+        return start, end
+    except Exception:
+        return None, None
+
+
+def dates_from_summary(summary):
+    schedule = (summary or {}).get('application_schedule') or {}
+    start, end = parse_period(schedule.get('online_application_period'))
+    return parse_ymd(schedule.get('announcement_date')), start, end
+
+
+def backfill_dates(apps, schema_editor):
+    """기존 공고의 AI 요약에서 posted_date / application_start / application_end 채우기"""
+    Announcement = apps.get_model('announcements', 'Announcement')
+    AnnouncementSummary = apps.get_model('announcements', 'AnnouncementSummary')
+
+    summaries = dict(AnnouncementSummary.objects.values_list('announcement_id', 'ai_summary_json'))
+    pending = []
+    for ann in Announcement.objects.filter(id__in=list(summaries)).iterator():
+        ann.posted_date, ann.application_start, ann.application_end = dates_from_summary(
+            summaries[ann.id]
+        )
+        pending.append(ann)
+    Announcement.objects.bulk_update(
+        pending, ['posted_date', 'application_start', 'application_end'], batch_size=200
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0021_announcement_posted_date_and_application_period'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_dates, migrations.RunPython.noop),
+    ]
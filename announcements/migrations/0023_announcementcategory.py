@@ -0,0 +1,47 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_categories(apps, schema_editor):
+    """기존 공고의 category_user/category_type 컬럼 → AnnouncementCategory 행"""
+    Announcement = apps.get_model('announcements', 'Announcement')
+    AnnouncementCategory = apps.get_model('announcements', 'AnnouncementCategory')
+
+    rows = []
+    for ann_id, category_user, category_type in Announcement.objects.values_list(
+        'id', 'category_user', 'category_type'
+    ).iterator():
+        for kind, names in (('user', category_user), ('type', category_type)):
+            for name in dict.fromkeys(names or []):
+                if name:
+                    rows.append(AnnouncementCategory(announcement_id=ann_id, kind=kind, name=str(name)[:100]))
+    AnnouncementCategory.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0022_backfill_announcement_dates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('user', '공급 대상'), ('type', '주택 유형')], max_length=10)),
+                ('name', models.CharField(max_length=100)),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='categories', to='announcements.announcement')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'name', 'announcement'], name='announcemen_kind_81e022_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='announcementcategory',
+            constraint=models.UniqueConstraint(fields=('announcement', 'kind', 'name'), name='unique_announcement_category'),
+        ),
+        migrations.RunPython(fill_categories, migrations.RunPython.noop),
+    ]
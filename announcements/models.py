@@ -1,9 +1,10 @@
-from django.db import models
+from django.db import models, connection
 from django.contrib.auth.models import User
 from django.conf import settings
 import os
 import re
 from django.utils.text import slugify
+from .caching import invalidate_user_overlays
 
 def get_upload_path(instance, filename):
     ext = os.path.splitext(filename)[1]
@@ -31,6 +32,10 @@ def get_upload_path(instance, filename):
 class Announcement(models.Model):
     title       = models.CharField(max_length=255)
     announcement_date   = models.CharField(max_length=50, null=True, blank=True)
+    # 정렬/기간 조회/상태 계산용 날짜 (import 시 announcements.tasks.announcement_dates_from_summary)
+    posted_date = models.DateField(null=True, blank=True)
+    application_start = models.DateField(null=True, blank=True, db_index=True)
+    application_end = models.DateField(null=True, blank=True, db_index=True)
     status        = models.CharField(
         max_length=10,
         choices=[('upcoming','모집예정'),
@@ -40,11 +45,60 @@ class Announcement(models.Model):
     updated_at    = models.DateTimeField(auto_now=True)
     pdf_name = models.CharField(max_length=255, null=True, blank=True)
 
-    ai_summary_json = models.JSONField(
-        null=True, 
-        blank=True, 
-        help_text="AI가 PDF에서 추출한 요약 JSON 데이터"
+    # 목록에 필요한 값은 요약 JSON에서 꺼내 컬럼으로 저장 (import 시 sync_summary_columns)
+    category_user = models.JSONField(default=list, blank=True)
+    category_type = models.JSONField(default=list, blank=True)
+    eligibility_criteria = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="import 시 자격 요건 텍스트를 미리 파싱한 구조화 조건 (analyzer.compile_notice_criteria)"
     )
+    criteria_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="자격 판정에 쓰이는 부분의 해시 (analyzer.notice_criteria_hash), 바뀌면 재분석"
+    )
+
+    @property
+    def ai_summary_json(self):
+        """AI 요약 원본 JSON (AnnouncementSummary, 없으면 None)"""
+        try:
+            return self.summary.ai_summary_json
+        except AnnouncementSummary.DoesNotExist:
+            return None
+
+    def sync_summary_columns(self, summary: dict):
+        """요약 JSON → 목록용 컬럼 (게시일 표시 형식, 카테고리)"""
+        schedule = summary.get("application_schedule") or {}
+        posted_raw = schedule.get("announcement_date")
+        if posted_raw and '미정' not in posted_raw:
+            self.announcement_date = posted_raw.replace('-', '.')
+        self.category_user = summary.get("category_user") or []
+        self.category_type = summary.get("category_type") or []
+
+    def sync_categories(self):
+        """category_user/category_type → AnnouncementCategory 행 (목록 카테고리 필터용, 저장 후 호출)"""
+        self.categories.all().delete()
+        AnnouncementCategory.objects.bulk_create(
+            AnnouncementCategory.rows_for(self.id, self.category_user, self.category_type),
+            ignore_conflicts=True,
+        )
+
+    def notice_data(self):
+        """analyzer에 넘길 공고 데이터 (미리 컴파일된 조건 포함)"""
+        if not self.ai_summary_json:
+            return None
+        if not self.eligibility_criteria:
+            return self.ai_summary_json
+        return {**self.ai_summary_json, "compiled_criteria": self.eligibility_criteria}
+
+    class Meta:
+        indexes = [
+            # 목록: 상태 필터 + 게시일/id 순 커서 페이지네이션
+            models.Index(fields=['status', 'posted_date', 'id']),
+            models.Index(fields=['posted_date', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.status})"
@@ -70,6 +124,55 @@ class Announcement(models.Model):
         return f"{self.announcement_id} – {self.doc_type}"
 '''
 
+
+class AnnouncementSummary(models.Model):
+    """공고 AI 요약 원본 (상세 조회/분석에서만 읽는 큰 JSON이라 목록 쿼리와 분리)"""
+    announcement = models.OneToOneField(
+        Announcement, primary_key=True, related_name='summary', on_delete=models.CASCADE
+    )
+    ai_summary_json = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="AI가 PDF에서 추출한 요약 JSON 데이터"
+    )
+
+    def __str__(self):
+        return f"{self.announcement_id} 요약"
+
+
+class AnnouncementCategory(models.Model):
+    """
+    공고 카테고리 (목록 category_user/category_type 필터용 정규화 테이블)
+    JSON 컬럼의 포함 조회는 인덱스를 못 타서 (kind, name) 인덱스로 조회
+    """
+    KIND_USER = 'user'
+    KIND_TYPE = 'type'
+
+    announcement = models.ForeignKey(Announcement, related_name='categories', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=10, choices=[(KIND_USER, '공급 대상'), (KIND_TYPE, '주택 유형')])
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['announcement', 'kind', 'name'], name='unique_announcement_category'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'name', 'announcement']),
+        ]
+
+    @classmethod
+    def rows_for(cls, announcement_id, category_user, category_type):
+        return [
+            cls(announcement_id=announcement_id, kind=kind, name=str(name)[:100])
+            for kind, names in ((cls.KIND_USER, category_user), (cls.KIND_TYPE, category_type))
+            for name in dict.fromkeys(names or [])
+            if name
+        ]
+
+    def __str__(self):
+        return f"{self.announcement_id} {self.kind}:{self.name}"
+
+
 class HousingInfo(models.Model):
     id = models.AutoField(primary_key=True)
     announcement = models.ForeignKey(Announcement, related_name='housing_info_list', on_delete=models.CASCADE)
@@ -83,16 +186,68 @@ class HousingInfo(models.Model):
     elevator = models.BooleanField(default=False)
     parking = models.TextField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['district', 'announcement']),
+        ]
+
     def __str__(self):
         return f"{self.name} – {self.house_type}"
 
+
+class HousingEligibilityAnalysisManager(models.Manager):
+    UPSERT_FIELDS = ['is_eligible', 'priority', 'reasons', 'decided_by', 'analyzed_at', 'is_stale']
+
+    def bulk_upsert(self, analyses, batch_size=500):
+        """
+        (user, announcement) 기준 일괄 저장: 행마다 SELECT + UPDATE/INSERT 대신 배치당 쿼리 1번
+        """
+        analyses = list(analyses)
+        if not analyses:
+            return []
+        options = {'update_conflicts': True, 'update_fields': self.UPSERT_FIELDS}
+        # MySQL은 ON DUPLICATE KEY UPDATE라 충돌 기준 컬럼을 지정할 수 없음
+        if connection.features.supports_update_conflicts_with_target:
+            options['unique_fields'] = ['user', 'announcement']
+        saved = self.bulk_create(analyses, batch_size=batch_size, **options)
+        # 목록 응답에 합쳐지는 사용자별 자격 결과 캐시 무효화
+        invalidate_user_overlays(analysis.user_id for analysis in analyses)
+        return saved
+
+    def from_result(self, user_id, announcement_id, result: dict):
+        """analyzer 결과 dict → 저장 전 인스턴스"""
+        return self.model(
+            user_id=user_id,
+            announcement_id=int(announcement_id),
+            is_eligible=result.get("is_eligible", False),
+            priority=result.get("priority", "해당없음"),
+            reasons=result.get("reasons", []),
+            decided_by=result.get("decided_by", 'llm'),
+        )
+
+    def bulk_upsert_results(self, user_id, results: dict):
+        """{공고ID: 분석 결과} → 사용자 1명의 분석 결과 일괄 저장"""
+        return self.bulk_upsert(
+            self.from_result(user_id, ann_id, result) for ann_id, result in results.items()
+        )
+
+
 class HousingEligibilityAnalysis(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='eligibility_analyses')
     announcement = models.ForeignKey(Announcement, on_delete=models.CASCADE, related_name='eligibility_analyses')
     is_eligible = models.BooleanField(default=False)
     priority = models.CharField(max_length=100, default="")
     reasons = models.JSONField(default=list)  # 자격 판단 사유 리스트를 저장
+    decided_by = models.CharField(
+        max_length=10,
+        choices=[('rule', '규칙 판정'), ('llm', 'AI 판정')],
+        default='llm'
+    )
     analyzed_at = models.DateTimeField(auto_now=True)
+    # 공고 자격 요건이 바뀌어 다시 분석해야 하는 결과 (재분석 저장 시 False로 돌아감)
+    is_stale = models.BooleanField(default=False)
+
+    objects = HousingEligibilityAnalysisManager()
 
     class Meta:
         unique_together = ('user', 'announcement')
@@ -102,5 +257,44 @@ class HousingEligibilityAnalysis(models.Model):
             models.Index(fields=['priority']),
         ]
 
+    def to_result(self):
+        return {
+            "is_eligible": self.is_eligible,
+            "priority": self.priority,
+            "reasons": self.reasons,
+            "used_criteria": "application_eligibility",
+            "decided_by": self.decided_by,
+        }
+
     def __str__(self):
         return f"{self.user.email} - {self.announcement.title} ({self.priority})"
+
+
+class EligibilityVerdict(models.Model):
+    """
+    자격 판정 지문(eligibility fingerprint)별 분석 결과
+    같은 지문의 사용자는 이 결과를 복사해서 HousingEligibilityAnalysis를 채움
+    """
+    fingerprint = models.CharField(max_length=64, unique=True)
+    announcement = models.ForeignKey(Announcement, on_delete=models.CASCADE, related_name='eligibility_verdicts')
+    is_eligible = models.BooleanField(default=False)
+    priority = models.CharField(max_length=100, default="")
+    reasons = models.JSONField(default=list)
+    decided_by = models.CharField(
+        max_length=10,
+        choices=[('rule', '규칙 판정'), ('llm', 'AI 판정')],
+        default='llm'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def to_result(self):
+        return {
+            "is_eligible": self.is_eligible,
+            "priority": self.priority,
+            "reasons": self.reasons,
+            "used_criteria": "application_eligibility",
+            "decided_by": self.decided_by,
+        }
+
+    def __str__(self):
+        return f"{self.announcement_id} - {self.fingerprint[:12]} ({self.priority})"
@@ -0,0 +1,97 @@
+import base64
+import json
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination:
+    """
+    정렬 키 (필드, 내림차순 여부) 기준 커서 페이지네이션
+    - 마지막 행의 정렬 키 값을 커서로 넘겨서 다음 페이지는 WHERE (키) > (커서) 로 조회 (OFFSET 없음)
+    - 정렬 키의 마지막 필드는 유일해야 함 (보통 id)
+    - NULL은 가장 작은 값으로 취급 (MySQL/SQLite 정렬 기준: 내림차순이면 맨 뒤)
+    - page_size 또는 cursor 파라미터가 있을 때만 적용 (없으면 기존처럼 전체 목록)
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def __init__(self, ordering):
+        self.ordering = list(ordering)
+        self.page_size = settings.ANNOUNCEMENT_PAGE_SIZE
+        self.max_page_size = settings.ANNOUNCEMENT_MAX_PAGE_SIZE
+
+    def is_requested(self, request) -> bool:
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def order_by(self):
+        return [f"-{name}" if desc else name for name, desc in self.ordering]
+
+    def get_page_size(self, request) -> int:
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            size = int(raw)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: "정수여야 합니다."})
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, position: list) -> str:
+        data = json.dumps(position, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> list:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except (ValueError, UnicodeError):
+            raise ValidationError({self.cursor_query_param: "잘못된 커서입니다."})
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise ValidationError({self.cursor_query_param: "잘못된 커서입니다."})
+        return position
+
+    def position_filter(self, position: list) -> Q:
+        """(a, b, c) 이후 행: a>A or (a=A and b>B) or (a=A and b=B and c>C) (내림차순은 <)"""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, desc), value in zip(self.ordering, position):
+            if value is None:
+                # NULL 다음: 오름차순이면 NULL 아닌 값 전부, 내림차순이면 없음
+                after = Q(**{f"{name}__isnull": False}) if not desc else Q(pk__in=[])
+                same = Q(**{f"{name}__isnull": True})
+            else:
+                lookup = 'lt' if desc else 'gt'
+                after = Q(**{f"{name}__{lookup}": value})
+                if desc:
+                    after |= Q(**{f"{name}__isnull": True})
+                same = Q(**{name: value})
+            condition |= equal & after
+            equal &= same
+        return condition
+
+    def paginate_queryset(self, queryset, request) -> list:
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.position_filter(self.decode_cursor(cursor)))
+        page_size = self.get_page_size(request)
+        # 한 건 더 읽어서 다음 페이지가 있는지 확인
+        rows = list(queryset.order_by(*self.order_by())[:page_size + 1])
+        page = rows[:page_size]
+        self.next_cursor = None
+        if len(rows) > page_size:
+            self.next_cursor = self.encode_cursor([getattr(page[-1], name) for name, _ in self.ordering])
+        return page
+
+    def get_next_link(self, request, next_cursor):
+        if not next_cursor:
+            return None
+        return replace_query_param(request.build_absolute_uri(), self.cursor_query_param, next_cursor)
+
+    def get_paginated_response(self, request, results: list, next_cursor) -> Response:
+        """next_cursor: paginate_queryset 후의 self.next_cursor (캐시된 페이지면 저장해 둔 값)"""
+        return Response({"next": self.get_next_link(request, next_cursor), "results": results})
@@ -24,10 +24,26 @@ class HousingInfoSerializer(serializers.ModelSerializer):
 
 class AnnouncementDetailSerializer(serializers.ModelSerializer):
     housing_info_list = HousingInfoSerializer(many=True, read_only=True)
+    ai_summary_json = serializers.JSONField(read_only=True)
 
     class Meta:
         model = Announcement
-        fields = '__all__'
+        # eligibility_criteria / criteria_hash는 내부 판정용이라 응답에서 제외
+        fields = [
+            'id',
+            'title',
+            'announcement_date',
+            'posted_date',
+            'application_start',
+            'application_end',
+            'status',
+            'updated_at',
+            'pdf_name',
+            'category_user',
+            'category_type',
+            'ai_summary_json',
+            'housing_info_list',
+        ]
 
 class HousingAnalysisResponseSerializer(serializers.Serializer):
     success = serializers.BooleanField()
@@ -4,9 +4,14 @@ import logging
 import re
 from datetime import date, datetime
 from typing import Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
 from django.utils import timezone
-from celery import shared_task
-from .models import Announcement
+from celery import chord, shared_task
+from .caching import bump_catalog_version
+from .models import Announcement, EligibilityVerdict, HousingEligibilityAnalysis
+import analyzer
 
 logger = logging.getLogger(__name__)
 
@@ -115,58 +120,284 @@ def parse_period_safe(s: str) -> Tuple[Optional[date], Optional[date]]:
         return None, None
 
 
+def announcement_dates_from_summary(summary: dict) -> Tuple[Optional[date], Optional[date], Optional[date]]:
+    """AI 요약 JSON → (게시일, 신청 시작일, 신청 마감일), 파싱 실패는 None"""
+    schedule = (summary or {}).get("application_schedule") or {}
+    posted = parse_ymd_safe(schedule.get("announcement_date"))
+    start, end = parse_period_safe(schedule.get("online_application_period"))
+    return posted, start, end
+
+
+def _fill_missing_dates(announcements) -> int:
+    """신청 기간 컬럼이 비어 있는 공고를 AI 요약에서 파싱해 채움 (import/마이그레이션 전 데이터 대비)"""
+    missing = list(
+        announcements.filter(Q(application_start__isnull=True) | Q(application_end__isnull=True))
+        .select_related('summary')
+    )
+    filled = []
+    for ann in missing:
+        posted, start, end = announcement_dates_from_summary(ann.ai_summary_json)
+        if start and end:
+            ann.posted_date = ann.posted_date or posted
+            ann.application_start, ann.application_end = start, end
+            filled.append(ann)
+    Announcement.objects.bulk_update(filled, ['posted_date', 'application_start', 'application_end'])
+    if filled:
+        logger.info(f"✅ 신청 기간 컬럼 채움: {[ann.id for ann in filled]}")
+    return len(filled)
+
+
 @shared_task(queue='status')
 def update_announcements_status_from_ai_json():
+    """
+    신청 기간 컬럼(application_start/application_end, import 시 AI 요약에서 파싱) 기준 상태 갱신
+    행마다 JSON을 읽지 않고 상태별 인덱스 조회 + UPDATE
+    기간 컬럼이 비어 있는 공고는 AI 요약에서 다시 파싱해 채운 뒤 계산
+    """
     logger.info("▶▶▶ Task START: update_announcements_status_from_ai_json")
     today = timezone.localdate()
 
     announcements = Announcement.objects.exclude(status='closed')
-    
-    updated_count = 0
-    skipped_count = 0
-    error_count = 0
+    _fill_missing_dates(announcements)
+    dated = announcements.filter(application_start__isnull=False, application_end__isnull=False)
+    targets = {
+        'upcoming': dated.filter(application_start__gt=today),
+        'open': dated.filter(application_start__lte=today, application_end__gte=today),
+        'closed': dated.filter(application_end__lt=today),
+    }
 
-    for ann in announcements:
-        if not ann.ai_summary_json:
-            logger.debug(f"⚠️ AI 요약본 없음 → {ann.id}: {ann.title}")
-            skipped_count += 1
+    updated_count = 0
+    for new_status, qs in targets.items():
+        ids = list(qs.exclude(status=new_status).values_list('id', flat=True))
+        if not ids:
             continue
+        Announcement.objects.filter(id__in=ids).update(status=new_status)
+        logger.info(f"✅ 상태 업데이트 → {new_status}: {ids}")
+        updated_count += len(ids)
 
-        try:
-            schedule_data = ann.ai_summary_json.get("application_schedule", {})
-            period_raw = schedule_data.get("online_application_period")
-            posted_date_raw = schedule_data.get("announcement_date")
-        except Exception as e:
-            logger.error(f"❌ JSON 스키마 파싱 실패 → {ann.id}: {ann.title} - {e}")
-            error_count += 1
-            continue
+    # 공고 목록 캐시 무효화
+    if updated_count:
+        bump_catalog_version()
+
+    skipped_count = announcements.count() - dated.count()
+    if skipped_count:
+        logger.warning(f"⚠️ 신청 기간 파싱 불가 {skipped_count}건 → 상태 갱신 생략")
+
+    logger.info(f"▶▶▶ Task END: 업데이트={updated_count}, 스킵={skipped_count}")
+
+
+def backfill_progress_key(announcement_id: int) -> str:
+    return f"announcement_backfill:{announcement_id}"
 
-        if not period_raw:
-            logger.debug(f"⚠️ 신청 기간 없음 → {ann.id}: {ann.title}")
-            skipped_count += 1
+
+# 청크 작업이 여러 워커에서 동시에 더하는 값은 키를 나눠 incr로 기록
+BACKFILL_COUNTERS = ("processed", "analyzed", "failed")
+
+
+def _backfill_counter_key(announcement_id: int, name: str) -> str:
+    return f"{backfill_progress_key(announcement_id)}:{name}"
+
+
+def get_backfill_progress(announcement_id: int) -> Optional[dict]:
+    progress = cache.get(backfill_progress_key(announcement_id))
+    if progress is None:
+        return None
+    counters = cache.get_many([_backfill_counter_key(announcement_id, name) for name in BACKFILL_COUNTERS])
+    for name in BACKFILL_COUNTERS:
+        progress[name] = counters.get(_backfill_counter_key(announcement_id, name), progress.get(name, 0))
+    return progress
+
+
+def _set_backfill_progress(announcement_id: int, progress: dict) -> None:
+    cache.set(backfill_progress_key(announcement_id), progress, settings.ANNOUNCEMENT_BACKFILL_PROGRESS_TTL)
+
+
+def _reset_backfill_counters(announcement_id: int) -> None:
+    cache.set_many(
+        {_backfill_counter_key(announcement_id, name): 0 for name in BACKFILL_COUNTERS},
+        settings.ANNOUNCEMENT_BACKFILL_PROGRESS_TTL,
+    )
+
+
+def _add_backfill_counts(announcement_id: int, **counts) -> None:
+    for name, value in counts.items():
+        if not value:
             continue
+        key = _backfill_counter_key(announcement_id, name)
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            cache.set(key, value, settings.ANNOUNCEMENT_BACKFILL_PROGRESS_TTL)
+
+
+def analyze_profiles_for_notice(announcement_id: int, notice_json: dict, profiles: list) -> dict:
+    """
+    공고 1건 × 프로필 묶음 분석 → {user_id: 결과}
+    같은 자격 판정 지문은 한 번만 분석하고, 이미 있는 지문의 판정은 그대로 복사
+    """
+    from profiles.tasks import profile_to_user_data
+
+    user_data_by_fp = {}
+    fp_by_user = {}
+    for profile in profiles:
+        user_data = profile_to_user_data(profile)
+        fp = analyzer.eligibility_fingerprint(user_data, notice_json)
+        fp_by_user[profile.user_id] = fp
+        user_data_by_fp.setdefault(fp, user_data)
 
-        start, end = parse_period_safe(period_raw)
-        announcement_date = parse_ymd_safe(posted_date_raw) or ann.announcement_date
+    verdicts = {
+        v.fingerprint: v.to_result()
+        for v in EligibilityVerdict.objects.filter(fingerprint__in=user_data_by_fp.keys())
+    }
+    missing = [fp for fp in user_data_by_fp if fp not in verdicts]
+    # 대량 작업 레인: 사용자 요청 분석에 쓸 호출 한도를 남겨 둠
+    with analyzer.use_lane(analyzer.RATE_LIMIT_LANE_BULK):
+        analyzed = analyzer.analyze_applicants_for_notice(
+            notice_json, [user_data_by_fp[fp] for fp in missing]
+        )
 
-        if not start or not end:
-            logger.warning(f"❌ 날짜 변환 실패 → {ann.id}: {ann.title} (raw: {period_raw})")
-            error_count += 1
+    new_verdicts = []
+    for fp, result in zip(missing, analyzed):
+        if result is None:
             continue
+        verdicts[fp] = result
+        new_verdicts.append(EligibilityVerdict(
+            fingerprint=fp,
+            announcement_id=announcement_id,
+            is_eligible=result.get("is_eligible", False),
+            priority=result.get("priority", ""),
+            reasons=result.get("reasons", []),
+            decided_by=result.get("decided_by", analyzer.DECIDED_BY_LLM),
+        ))
+    EligibilityVerdict.objects.bulk_create(new_verdicts, ignore_conflicts=True)
 
-        if today < start:
-            new_status = 'upcoming'
-        elif start <= today <= end:
-            new_status = 'open'
-        else:
-            new_status = 'closed'
+    return {
+        user_id: verdicts[fp] for user_id, fp in fp_by_user.items() if fp in verdicts
+    }
+
+
+@shared_task(bind=True)
+def analyze_announcement_for_all_users_task(self, announcement_id: int):
+    """
+    새로 import된 공고 1건을 모든 사용자에 대해 분석 (전체 재분석 없이 O(사용자 수))
+    프로필을 id 범위 청크로 나눠 chord로 분배 → 청크마다 별도 작업이라 작업 시간 제한(CELERY_TASK_TIME_LIMIT)에 걸리지 않음
+    chord 1개에는 청크 ANNOUNCEMENT_BACKFILL_GROUP_CHUNKS개만 넣고, 끝나면 다음 id 범위를 이어서 분배
+    (프로필 id 전체를 메모리/메시지에 올리지 않음)
+    진행 상황은 캐시에 기록 (get_backfill_progress)
+    """
+    from profiles.models import Profile
+
+    logger.info(f"▶▶▶ Task START: analyze_announcement_for_all_users - ann={announcement_id}")
+    progress = {
+        "status": "running",
+        "total": 0,
+        "processed": 0,
+        "analyzed": 0,
+        "failed": 0,
+        "started_at": timezone.now().isoformat(),
+        "finished_at": None,
+    }
+
+    try:
+        ann = Announcement.objects.select_related('summary').get(id=announcement_id)
+        if not ann.notice_data():
+            logger.debug(f"⚠️ AI 요약본 없음 → {ann.id}: {ann.title}")
+            progress.update(status="skipped", finished_at=timezone.now().isoformat())
+            _set_backfill_progress(announcement_id, progress)
+            return progress
+
+        progress["total"] = Profile.objects.count()
+        _reset_backfill_counters(announcement_id)
+        _set_backfill_progress(announcement_id, progress)
+        _dispatch_backfill_group(announcement_id, after_id=0)
+        return progress
+
+    except Exception:
+        logger.exception(f"❌ 공고 백필 실패 → ann={announcement_id}")
+        progress.update(status="error", finished_at=timezone.now().isoformat())
+        _set_backfill_progress(announcement_id, progress)
+        return progress
+
+
+def _dispatch_backfill_group(announcement_id: int, after_id: int) -> None:
+    """
+    id > after_id 인 프로필부터 청크 ANNOUNCEMENT_BACKFILL_GROUP_CHUNKS개를 chord로 분배
+    청크는 id 목록 대신 (after_id, end_id] 범위로 넘김, 남은 프로필이 없으면 백필 종료
+    """
+    from profiles.models import Profile
+
+    chunk_size = settings.ANNOUNCEMENT_BACKFILL_CHUNK_SIZE
+    group_ids = list(
+        Profile.objects.filter(id__gt=after_id).order_by('id')
+        .values_list('id', flat=True)[:chunk_size * settings.ANNOUNCEMENT_BACKFILL_GROUP_CHUNKS]
+    )
+    if not group_ids:
+        finish_announcement_backfill_task.delay([], announcement_id)
+        return
+
+    ranges = []
+    start = after_id
+    for i in range(0, len(group_ids), chunk_size):
+        end = group_ids[i:i + chunk_size][-1]
+        ranges.append((start, end))
+        start = end
+
+    chord(
+        analyze_announcement_chunk_task.s(announcement_id, start_id, end_id) for start_id, end_id in ranges
+    )(continue_announcement_backfill_task.s(announcement_id, ranges[-1][1]))
+    logger.info(f"▶▶▶ 청크 {len(ranges)}개 분배 - ann={announcement_id}, 프로필 id {after_id + 1}~{ranges[-1][1]}")
+
+
+@shared_task
+def continue_announcement_backfill_task(chunk_results: list, announcement_id: int, after_id: int):
+    """chord 콜백: 다음 id 범위 분배 (남은 프로필이 없으면 종료)"""
+    _dispatch_backfill_group(announcement_id, after_id)
+
+
+@shared_task(soft_time_limit=settings.ANNOUNCEMENT_BACKFILL_CHUNK_SOFT_LIMIT)
+def analyze_announcement_chunk_task(announcement_id: int, start_id: int, end_id: int):
+    """
+    공고 1건 × 프로필 청크(start_id < id <= end_id) 분석/저장
+    반환: 저장한 결과 수, 실패(시간 초과 포함)하면 None (다른 청크에는 영향 없음)
+    """
+    from profiles.models import Profile
+    from profiles.tasks import merge_priority_info
+
+    profiles = []
+    try:
+        ann = Announcement.objects.select_related('summary').get(id=announcement_id)
+        profiles = list(Profile.objects.filter(id__gt=start_id, id__lte=end_id))
+        results = analyze_profiles_for_notice(ann.id, ann.notice_data(), profiles)
+
+        HousingEligibilityAnalysis.objects.bulk_upsert(
+            HousingEligibilityAnalysis.objects.from_result(user_id, ann.id, result)
+            for user_id, result in results.items()
+        )
+        # 프로필 요약(priority_info)에 이 공고 결과만 추가
+        merge_priority_info({user_id: {str(ann.id): result} for user_id, result in results.items()})
+
+        _add_backfill_counts(
+            announcement_id,
+            processed=len(profiles),
+            analyzed=len(results),
+            failed=len(profiles) - len(results),
+        )
+        return len(results)
+
+    except Exception:
+        logger.exception(f"❌ 공고 백필 청크 실패 → ann={announcement_id}, 프로필 id {start_id + 1}~{end_id}")
+        count = len(profiles) or Profile.objects.filter(id__gt=start_id, id__lte=end_id).count()
+        _add_backfill_counts(announcement_id, processed=count, failed=count)
+        return None
 
-        if ann.status != new_status or ann.announcement_date != announcement_date:
-            old_status = ann.status
-            ann.status = new_status
-            ann.announcement_date = announcement_date
-            ann.save(update_fields=['status', 'announcement_date'])
-            logger.info(f"✅ 상태 업데이트: {ann.id} ({old_status} → {new_status})")
-            updated_count += 1
 
-    logger.info(f"▶▶▶ Task END: 업데이트={updated_count}, 스킵={skipped_count}, 에러={error_count}")
\ No newline at end of file
+@shared_task
+def finish_announcement_backfill_task(chunk_results: list, announcement_id: int):
+    progress = get_backfill_progress(announcement_id) or {}
+    progress.update(status="done", finished_at=timezone.now().isoformat())
+    _set_backfill_progress(announcement_id, progress)
+    logger.info(
+        f"▶▶▶ Task END: ann={announcement_id}, 처리={progress.get('processed')}, "
+        f"분석={progress.get('analyzed')}, 실패={progress.get('failed')}"
+    )
+    return progress
@@ -0,0 +1,156 @@
+from datetime import date, timedelta
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from users.models import User
+import analyzer
+from .models import Announcement, AnnouncementCategory, HousingEligibilityAnalysis
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'announcements-tests',
+    },
+    'coordination': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'announcements-tests-coordination',
+    },
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class AnnouncementListQueryCountTests(APITestCase):
+    """공고 수가 늘어도 목록 조회 쿼리 수는 그대로 (공고마다 분석 결과를 조회하지 않음)"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email='list@example.com', nickname='list')
+        self.url = reverse('announcement-list')
+
+    def add_announcements(self, count):
+        start = Announcement.objects.count()
+        for i in range(start, start + count):
+            ann = Announcement.objects.create(
+                title=f'공고 {i}',
+                status=['open', 'upcoming', 'closed'][i % 3],
+                announcement_date=f'2025.01.{i % 28 + 1:02d}.',
+                posted_date=date(2025, 1, 1) + timedelta(days=i),
+                category_user=['청년'],
+                category_type=['임대주택'],
+            )
+            ann.sync_categories()
+            HousingEligibilityAnalysis.objects.create(
+                user=self.user, announcement=ann, is_eligible=i % 2 == 0, priority='1순위'
+            )
+
+    def get_list(self, expected_queries):
+        # 캐시가 빈 상태의 DB 쿼리 수
+        cache.clear()
+        with self.assertNumQueries(expected_queries):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_anonymous_query_count_is_constant(self):
+        self.add_announcements(5)
+        self.assertEqual(len(self.get_list(1)), 5)
+        self.add_announcements(5)
+        data = self.get_list(1)
+        self.assertEqual(len(data), 10)
+        self.assertTrue(all(row['analysis'] is None for row in data))
+
+    def test_authenticated_query_count_is_constant(self):
+        self.client.force_authenticate(self.user)
+        self.add_announcements(5)
+        self.assertEqual(len(self.get_list(2)), 5)
+        self.add_announcements(5)
+        data = self.get_list(2)
+        self.assertEqual(len(data), 10)
+        self.assertTrue(all(row['analysis'] is not None for row in data))
+
+    def test_cached_list_needs_no_queries(self):
+        self.client.force_authenticate(self.user)
+        self.add_announcements(5)
+        self.get_list(2)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_overlay_refreshes_after_upsert(self):
+        self.client.force_authenticate(self.user)
+        self.add_announcements(3)
+        self.client.get(self.url)
+        ann = Announcement.objects.order_by('id').first()
+        HousingEligibilityAnalysis.objects.bulk_upsert([
+            HousingEligibilityAnalysis.objects.from_result(
+                self.user.id, ann.id, {'is_eligible': True, 'priority': '2순위'}
+            )
+        ])
+        # 공개 목록은 캐시 그대로, 사용자 결과만 다시 조회
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        row = next(row for row in response.json() if row['id'] == ann.id)
+        self.assertEqual(row['analysis'], {'is_eligible': True, 'priority': '2순위'})
+
+    def test_category_filter_uses_category_rows(self):
+        self.add_announcements(4)
+        ann = Announcement.objects.order_by('id').first()
+        ann.category_user = ['신혼부부']
+        ann.save(update_fields=['category_user'])
+        ann.sync_categories()
+        self.assertEqual(
+            set(AnnouncementCategory.objects.filter(announcement=ann).values_list('kind', 'name')),
+            {('user', '신혼부부'), ('type', '임대주택')},
+        )
+        response = self.client.get(self.url, {'category_user': '신혼부부'})
+        self.assertEqual([row['id'] for row in response.json()], [ann.id])
+        response = self.client.get(self.url, {'category_type': '임대주택'})
+        self.assertEqual(len(response.json()), 4)
+
+
+class AnnouncementDetailFieldsTests(APITestCase):
+    def test_internal_criteria_not_exposed(self):
+        ann = Announcement.objects.create(
+            title='상세 공고',
+            status='open',
+            eligibility_criteria={'income': {'max': 100}},
+            criteria_hash='abc',
+        )
+        response = self.client.get(reverse('announcement-detail', args=[ann.id]))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['title'], '상세 공고')
+        self.assertNotIn('eligibility_criteria', data)
+        self.assertNotIn('criteria_hash', data)
+
+
+class NoticeAgeCriteriaTests(SimpleTestCase):
+    """연령 상한 규칙 탈락은 신청자 연령 범위가 명시된 경우만"""
+
+    def notice(self, eligibility):
+        return {
+            "application_schedule": {"announcement_date": "2025.06.01"},
+            "application_eligibility": eligibility,
+        }
+
+    def prescreen(self, notice, birth_date):
+        preprocessed = analyzer.preprocess_user_data({"birth_date": birth_date, "total_assets": 0}, notice)
+        return analyzer.prescreen_eligibility(preprocessed, notice)
+
+    def test_child_age_is_not_applicant_cap(self):
+        notice = self.notice("무주택세대구성원으로서 만 19세 이상인 자. 단, 만 19세 미만 자녀를 둔 한부모가족 우선")
+        self.assertIsNone(analyzer.compile_notice_criteria(notice)["age_max"])
+        self.assertIsNone(self.prescreen(notice, "19950101"))
+
+    def test_sub_track_age_is_not_applicant_cap(self):
+        notice = self.notice("대학생(만 39세 이하) 및 청년")
+        self.assertIsNone(analyzer.compile_notice_criteria(notice)["age_max"])
+        self.assertIsNone(self.prescreen(notice, "19800101"))
+
+    def test_explicit_range_sets_cap(self):
+        notice = self.notice("만 19세 이상 ~ 만 39세 이하인 무주택자")
+        self.assertEqual(analyzer.compile_notice_criteria(notice)["age_max"], 39)
+        self.assertFalse(self.prescreen(notice, "19800101")["is_eligible"])
+        notice = self.notice("만 19세 이상 39세 미만인 자")
+        self.assertEqual(analyzer.compile_notice_criteria(notice)["age_max"], 38)
@@ -3,7 +3,8 @@ from .views import (
     AnnouncementListAPIView,
     AnnouncementDetailAPIView,
     AnnouncementHouseAPIView,
-    OpenAnnouncementAPIView
+    OpenAnnouncementAPIView,
+    AnnouncementBackfillProgressAPIView
 )
 
 urlpatterns = [
@@ -11,5 +12,6 @@ urlpatterns = [
     path('open/', OpenAnnouncementAPIView.as_view(), name='announcement-open'),
     path('house/<int:house_id>/', AnnouncementHouseAPIView.as_view(), name='announcement-house'),
     path('<int:id>/', AnnouncementDetailAPIView.as_view(), name='announcement-detail'),
+    path('<int:id>/backfill/', AnnouncementBackfillProgressAPIView.as_view(), name='announcement-backfill-progress'),
 ]
 
@@ -3,104 +3,180 @@ from django.shortcuts import get_object_or_404
 import json, os
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from rest_framework.exceptions import ValidationError, NotAuthenticated
 from .models import Announcement
 from rest_framework.views import APIView
-from .models import Announcement, HousingEligibilityAnalysis
+from .models import Announcement, AnnouncementCategory, HousingEligibilityAnalysis
 from .models import HousingInfo
 from .serializers import HousingInfoSerializer, AnnouncementDetailSerializer, OpenAnnouncementSerializer
+from .caching import get_or_build_list_page, get_user_overlay
+from .pagination import KeysetCursorPagination
+from .tasks import get_backfill_progress
+from profiles.tasks import ANALYSIS_STATUSES, request_announcement_analysis
 
-from django.db.models import Case, When, IntegerField
+from django.db.models import Case, When, IntegerField, Exists, OuterRef
+from django.utils.dateparse import parse_date
 
 class AnnouncementListAPIView(generics.ListAPIView):
     permission_classes=[AllowAny]
 
+    STATUS_CHOICES = ['upcoming', 'open', 'closed']
+
+    def apply_filters(self, qs):
+        """
+        목록 필터 (모두 선택)
+        - status: 쉼표 구분 (예: open,upcoming)
+        - category_user / category_type: 해당 카테고리를 포함하는 공고
+        - district: 해당 자치구 주택이 있는 공고
+        - eligible_only: 로그인 사용자가 자격 있는 공고만
+        - application_from / application_to (YYYY-MM-DD): 신청 기간이 이 범위와 겹치는 공고 (예: 이번 주 신청 가능)
+        """
+        params = self.request.query_params
+
+        statuses = [s for s in params.get('status', '').split(',') if s]
+        invalid = [s for s in statuses if s not in self.STATUS_CHOICES]
+        if invalid:
+            raise ValidationError({'status': f"알 수 없는 상태: {', '.join(invalid)}"})
+        if statuses:
+            qs = qs.filter(status__in=statuses)
+
+        # JSON 컬럼 포함 조회 대신 AnnouncementCategory (kind, name) 인덱스로 조회
+        for field, kind in (('category_user', AnnouncementCategory.KIND_USER),
+                            ('category_type', AnnouncementCategory.KIND_TYPE)):
+            value = params.get(field)
+            if value:
+                qs = qs.filter(Exists(
+                    AnnouncementCategory.objects.filter(kind=kind, name=value, announcement=OuterRef('pk'))
+                ))
+
+        for param, lookup in (('application_from', 'application_end__gte'), ('application_to', 'application_start__lte')):
+            value = params.get(param)
+            if value:
+                try:
+                    day = parse_date(value)
+                except ValueError:
+                    day = None
+                if day is None:
+                    raise ValidationError({param: "YYYY-MM-DD 형식이어야 합니다."})
+                qs = qs.filter(**{lookup: day})
+
+        district = params.get('district')
+        if district:
+            qs = qs.filter(Exists(
+                HousingInfo.objects.filter(district=district, announcement=OuterRef('pk'))
+            ))
+
+        if params.get('eligible_only') in ('1', 'true', 'True'):
+            if not self.request.user.is_authenticated:
+                raise NotAuthenticated("eligible_only는 로그인이 필요합니다.")
+            qs = qs.filter(Exists(
+                HousingEligibilityAnalysis.objects.filter(
+                    user=self.request.user, announcement=OuterRef('pk'), is_eligible=True
+                )
+            ))
+        return qs, statuses
+
+    # 사용자와 무관한 조회 조건 (공개 목록 캐시 키)
+    PUBLIC_QUERY_PARAMS = [
+        'status', 'category_user', 'category_type', 'district',
+        'application_from', 'application_to', 'cursor', 'page_size',
+    ]
+
+    def build_public_page(self, qs, paginator):
+        """공개 목록 한 페이지: {'rows': [...], 'next_cursor': ...} (사용자별 analysis 제외)"""
+        if paginator.is_requested(self.request):
+            rows = paginator.paginate_queryset(qs, self.request)
+            next_cursor = paginator.next_cursor
+        else:
+            rows = qs.order_by(*paginator.order_by())
+            next_cursor = None
+        return {
+            "rows": [
+                {
+                    "id": ann.id,
+                    "title": ann.title,
+                    "announcement_date": ann.announcement_date or "",
+                    "status": ann.status,
+                    "category_user": ann.category_user,
+                    "category_type": ann.category_type,
+                }
+                for ann in rows
+            ],
+            "next_cursor": next_cursor,
+        }
+
     def get(self, request):
-        qs = Announcement.objects.annotate(
+        # 목록에 필요한 컬럼만 읽음 (요약 JSON은 AnnouncementSummary에 따로 있음)
+        qs = Announcement.objects.only(
+            'id', 'title', 'announcement_date', 'posted_date', 'status', 'category_user', 'category_type'
+        ).annotate(
             status_order=Case(
                 When(status='upcoming', then=1),
                 When(status='open', then=2),
                 When(status='closed', then=3),
                 default=4,
                 output_field=IntegerField()
-            )
-        ).order_by('status_order', '-announcement_date')
-        
-        result = []
-        
-        for ann in qs:
-            posted = ann.announcement_date or ""
-            # 현재 로그인한 사용자의 자격 분석 정보 가져오기
-            analysis_info = None
-            if ann.ai_summary_json:
-                # ai_summary_json에 'application_schedule' 키가 있고, 그 안에 
-                # 'announcement_date'가 있다면 그것을 사용
-                schedule = ann.ai_summary_json.get('application_schedule', {})
-                posted_date_raw = schedule.get('announcement_date')
-                if posted_date_raw and '미정' not in posted_date_raw:
-                     posted = posted_date_raw.replace('-', '.')
-
-                category_user = ann.ai_summary_json.get('category_user', [])
-                category_type = ann.ai_summary_json.get('category_type', [])
-
-            # DB에서 직접 가져오기 
-            if request.user.is_authenticated:
-                try:
-                    analysis = HousingEligibilityAnalysis.objects.get(
-                        user=request.user,
-                        announcement=ann
-                    )
-                    analysis_info = {
-                        'is_eligible': analysis.is_eligible,
-                        'priority': analysis.priority
-                    }
-                except HousingEligibilityAnalysis.DoesNotExist:
-                    pass
-
-            result.append({
-                "id": ann.id,
-                "title": ann.title,
-                "announcement_date": posted,
-                "status": ann.status,
-                "category_user": category_user,
-                "category_type": category_type,
-                "analysis": analysis_info # 자격 O/X 여부
-            })
+            ),
+        )
+        qs, statuses = self.apply_filters(qs)
+
+        # 상태 하나만 고르면 (status, posted_date, id) 인덱스 순서 그대로
+        ordering = [('posted_date', True), ('id', True)]
+        if len(statuses) != 1:
+            ordering.insert(0, ('status_order', False))
+        paginator = KeysetCursorPagination(ordering)
+
+        # eligible_only는 사용자마다 결과가 달라서 공개 캐시를 쓰지 않음
+        if 'eligible_only' in request.query_params:
+            page = self.build_public_page(qs, paginator)
+        else:
+            params = {
+                name: request.query_params[name]
+                for name in self.PUBLIC_QUERY_PARAMS if name in request.query_params
+            }
+            page = get_or_build_list_page(params, lambda: self.build_public_page(qs, paginator))
+
+        # 현재 로그인한 사용자의 자격 O/X 여부는 사용자별 캐시에서 합침 (공고마다 조회하지 않음)
+        overlay = get_user_overlay(request.user.id) if request.user.is_authenticated else {}
+        result = [{**row, "analysis": overlay.get(row["id"])} for row in page["rows"]]
+
+        if paginator.is_requested(request):
+            return paginator.get_paginated_response(request, result, page["next_cursor"])
         return Response(result)
     
 class AnnouncementDetailAPIView(APIView):
     permission_classes=[AllowAny]
     
     def get(self, request, id):
-        ann = get_object_or_404(Announcement, id=id)
+        ann = get_object_or_404(Announcement.objects.select_related('summary'), id=id)
         serializer = AnnouncementDetailSerializer(ann)
         data = serializer.data
-        ai_summary = data.get("ai_summary_json", {})
-        posted = ann.announcement_date or ""
-        schedule_data = ai_summary.get("application_schedule", {})
-        if schedule_data:
-            posted_date_raw = schedule_data.get("announcement_date")
-            if posted_date_raw and '미정' not in posted_date_raw:
-                posted = posted_date_raw.replace('-', '.')
-        data["announcement_date"] = posted
+        # 게시일은 import 시 요약 JSON 기준 표시 형식으로 저장됨 (Announcement.sync_summary_columns)
+        data["announcement_date"] = ann.announcement_date or ""
 
         # 현재 로그인한 사용자의 자격 분석 정보 가져오기
         analysis_info = None
+        analysis_pending = False
         if request.user.is_authenticated:
-            try:
-                analysis = HousingEligibilityAnalysis.objects.get(
-                    user=request.user,
-                    announcement=ann
-                )
+            analysis = HousingEligibilityAnalysis.objects.filter(
+                user=request.user,
+                announcement=ann
+            ).first()
+            # 마감 공고는 미리 분석하지 않으므로 처음 열어볼 때(또는 결과가 오래됐을 때) 분석 등록
+            # 기다리지 않고 지금 있는 결과(없으면 None, 오래됐으면 is_stale)와 analysis_pending을 바로 응답
+            if (analysis is None or analysis.is_stale) and ann.status not in ANALYSIS_STATUSES:
+                analysis_pending = request_announcement_analysis(request.user.id, ann)
+            if analysis is not None:
                 analysis_info = {
                     'is_eligible': analysis.is_eligible,
                     'priority': analysis.priority,
                     'reasons': analysis.reasons if hasattr(analysis, 'reasons') else [],
-                    'analyzed_at': analysis.analyzed_at.isoformat() if analysis.analyzed_at else None
+                    'analyzed_at': analysis.analyzed_at.isoformat() if analysis.analyzed_at else None,
+                    'is_stale': analysis.is_stale,
                 }
-            except HousingEligibilityAnalysis.DoesNotExist:
-                pass
         data["analysis"] = analysis_info
+        data["analysis_pending"] = analysis_pending
         data["ai_precaution"] = (
             "본 정보는 AI를 활용하여 요약되었으며, 정확성이 보장되지 않을 수 있으므로 "
             "참고용으로만 사용하시기 바랍니다. 더 자세한 정보는 아래의 첨부파일을 참고하세요."
@@ -133,9 +209,24 @@ class OpenAnnouncementAPIView(APIView):
         qs = (
             Announcement.objects
             .filter(status__in=['open','upcoming'])
-            .order_by('-announcement_date')
+            .order_by('-posted_date', '-id')
             .prefetch_related('housing_info_list')
         )
 
         serializer = OpenAnnouncementSerializer(qs, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AnnouncementBackfillProgressAPIView(APIView):
+    """새 공고 import 후 전체 사용자 자격 분석(백필) 진행 상황 (관리자 전용)"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, id):
+        ann = get_object_or_404(Announcement, id=id)
+        progress = get_backfill_progress(ann.id)
+        if progress is None:
+            return Response({
+                "success": False,
+                "error": f"ID {ann.id} 공고의 백필 기록이 없습니다.",
+            }, status=status.HTTP_404_NOT_FOUND)
+        return Response({"success": True, "announcement_id": ann.id, **progress}, status=status.HTTP_200_OK)
@@ -219,17 +219,110 @@ CELERY_TASK_TRACK_STARTED = True  # (선택) task 시작/진행상태 추적
 CELERY_TASK_TIME_LIMIT = 600  
 CELERY_WORKER_LOG_LEVEL = 'INFO'
 
+# 자격 분석 큐: 사용자 요청(프로필 생성/수정)과 대량 작업(공고 백필)을 분리
+# 워커 구성 (대량 작업이 밀려도 사용자 요청은 전용 워커가 항상 처리)
+#   celery -A houscan worker -Q profile -n interactive@%h          # 사용자 요청 전용
+#   celery -A houscan worker -Q profile,profile_bulk -n shared@%h  # 남는 자원으로 대량 작업
+ANALYSIS_INTERACTIVE_QUEUE = os.getenv('ANALYSIS_INTERACTIVE_QUEUE', 'profile')
+ANALYSIS_BULK_QUEUE = os.getenv('ANALYSIS_BULK_QUEUE', 'profile_bulk')
+CELERY_TASK_ROUTES = {
+    'profiles.tasks.analyze_user_eligibility_task': {'queue': ANALYSIS_INTERACTIVE_QUEUE},
+    'profiles.tasks.analyze_eligibility_chunk_task': {'queue': ANALYSIS_INTERACTIVE_QUEUE},
+    'profiles.tasks.finalize_user_eligibility_task': {'queue': ANALYSIS_INTERACTIVE_QUEUE},
+    'profiles.tasks.requeue_stuck_analyses_task': {'queue': ANALYSIS_INTERACTIVE_QUEUE},
+    'profiles.tasks.analyze_announcement_on_demand_task': {'queue': ANALYSIS_INTERACTIVE_QUEUE},
+    'announcements.tasks.analyze_announcement_for_all_users_task': {'queue': ANALYSIS_BULK_QUEUE},
+    'announcements.tasks.analyze_announcement_chunk_task': {'queue': ANALYSIS_BULK_QUEUE},
+    'announcements.tasks.continue_announcement_backfill_task': {'queue': ANALYSIS_BULK_QUEUE},
+    'announcements.tasks.finish_announcement_backfill_task': {'queue': ANALYSIS_BULK_QUEUE},
+}
+# 긴 분석 작업을 미리 여러 개 가져가 다른 워커가 놀지 않도록 1개씩만 가져감
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# 워커가 재시작되어도 실행 중이던 작업이 사라지지 않도록 완료 후 ack
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_BEAT_SCHEDULE = {
+    'requeue-stuck-analyses': {
+        'task': 'profiles.tasks.requeue_stuck_analyses_task',
+        'schedule': crontab(minute='*/5'),
+    },
+}
+
 
 # Cache settings
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
         'LOCATION': 'redis://127.0.0.1:6379/1',
-    }
+    },
+    # 분석 실행 조정 상태(세대 번호, 큐 대기 표시, 대상 공고, 락) 전용
+    # 판정 캐시처럼 LRU로 지워지면 진행 중인 분석이 모두 중단된 것으로 보이므로
+    # 운영에서는 ANALYSIS_COORDINATION_REDIS_URL을 maxmemory-policy noeviction Redis 인스턴스로 지정
+    # (축출 정책은 DB가 아니라 인스턴스 단위라 기본값인 같은 인스턴스의 다른 DB로는 축출을 막지 못함)
+    'coordination': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('ANALYSIS_COORDINATION_REDIS_URL', 'redis://127.0.0.1:6379/3'),
+    },
 }
 
 # Cache timeout settings
-CACHE_TTL = 60  # 1 hour
+CACHE_TTL = 60  # 공고 목록 / 사용자별 자격 결과 캐시 유지 시간(초)
+ANNOUNCEMENT_LIST_LOCK_TTL = 10  # 공고 목록 캐시를 다시 만드는 요청의 잠금 시간(초)
+ANNOUNCEMENT_LIST_LOCK_WAIT = 2  # 다른 요청이 목록을 만드는 동안 기다리는 최대 시간(초)
+
+# LLM 자격 판정 캐시 (동일 프롬프트 재사용)
+ANALYZER_VERDICT_CACHE_TTL = 60 * 60 * 24 * 7  # 7일
+
+# 공고별 AI 분석 동시 실행 설정
+ANALYZER_MAX_CONCURRENCY = 8  # 동시에 진행하는 LLM 호출 수
+ANALYZER_CALL_TIMEOUT = 60  # 호출 1건당 제한 시간(초)
+ANALYZER_NOTICE_BATCH_SIZE = 5  # LLM 호출 1건에 묶는 공고 수 (1이면 공고별 단건 호출)
+ANALYZER_APPLICANT_BATCH_SIZE = 10  # 공고 1건 분석 시 LLM 호출 1건에 묶는 신청자 수
+
+# 사용자 1명 분석을 chord로 나눌 때 청크당 공고 수 (청크마다 다른 워커에서 처리)
+ANALYSIS_CHUNK_SIZE = 10
+ANALYSIS_RUN_STATE_TTL = 60 * 60  # 사용자별 대기/실행 중 분석 대상 기록 보관 시간(초)
+ANALYSIS_SCOPE_LOCK_TTL = 5  # 분석 대상 기록을 고쳐 쓰는 동안 잡는 락 유지 시간(초)
+ANALYSIS_SCOPE_LOCK_WAIT = 6  # 락을 기다리는 최대 시간(초), 넘기면 경고 후 진행 (보유자가 죽어도 TTL 뒤 풀림)
+ANALYSIS_CHUNK_TIME_BUDGET = 300  # 청크 1개 분석 시간 예산(초), 넘기면 남은 공고는 재시도로 이어서 (CELERY_TASK_TIME_LIMIT보다 작게)
+ANALYSIS_CHUNK_MAX_RESUMES = 3  # 청크 1개를 이어서 분석하는 최대 횟수
+ANALYSIS_STUCK_AFTER = 60 * 15  # 진행 기록이 이 시간(초) 넘게 없으면 멈춘 분석으로 보고 이어서 분석
+ANALYSIS_TTFV_BUCKETS = [5, 15, 60, 300]  # 신규 가입자 첫 판정까지 걸린 시간 집계 구간(초)
+ANALYSIS_BATCH_PROFILE_CHUNK_SIZE = 200  # 배치 파일 내보내기/적재 시 한 번에 읽는 프로필 수
+
+# 새 공고 import 후 전체 사용자 백필
+ANNOUNCEMENT_BACKFILL_CHUNK_SIZE = 100  # 청크 작업 1개가 분석/저장하는 프로필 수
+ANNOUNCEMENT_BACKFILL_GROUP_CHUNKS = 20  # chord 1개에 넣는 청크 수 (끝나면 다음 id 범위를 이어서 분배)
+# 청크 작업 시간 제한 (CELERY_TASK_TIME_LIMIT 강제 종료 전에 실패로 기록하고 끝냄)
+ANNOUNCEMENT_BACKFILL_CHUNK_SOFT_LIMIT = CELERY_TASK_TIME_LIMIT - 60
+ANNOUNCEMENT_BACKFILL_PROGRESS_TTL = 60 * 60 * 24  # 진행 상황 보관 시간(초)
+
+# 공고 목록 커서 페이지네이션 (page_size 또는 cursor 파라미터가 있을 때만)
+ANNOUNCEMENT_PAGE_SIZE = 20
+ANNOUNCEMENT_MAX_PAGE_SIZE = 100
+
+# OpenAI 클라이언트 (워커 프로세스당 1개 재사용)
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL')  # 비우면 공식 API, 로컬 가짜 서버 테스트 시 지정
+OPENAI_TIMEOUT = 60  # HTTP 요청 제한 시간(초)
+OPENAI_MAX_CONNECTIONS = 20  # 연결 풀 최대 크기
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 10  # keep-alive로 유지할 연결 수
+OPENAI_KEEPALIVE_EXPIRY = 30  # 유휴 연결 유지 시간(초)
+OPENAI_MAX_RETRIES = 4  # 429/5xx/연결 오류 재시도 횟수
+OPENAI_BACKOFF_BASE = 0.5  # 지수 백오프 시작 값(초), 실제 대기는 0~상한 사이 랜덤
+OPENAI_BACKOFF_MAX = 20  # 백오프 대기 상한(초)
+
+# 마감 공고 즉시 분석 락 유지 시간(초): 호출 제한 시간 × 시도 횟수 + 백오프 상한 + 큐 대기 여유 60초
+# (분석이 끝나기 전에 풀려서 같은 공고가 중복 등록되지 않도록, 워커가 죽으면 이 시간 뒤에 풀림)
+ANALYSIS_LAZY_LOCK_TTL = ANALYZER_CALL_TIMEOUT * (OPENAI_MAX_RETRIES + 1) + OPENAI_BACKOFF_MAX * OPENAI_MAX_RETRIES + 60
+
+# OpenAI 호출 속도 제한 (모든 워커가 Redis 토큰 버킷 공유, 한도를 비우거나 0이면 제한 없음)
+OPENAI_RATE_LIMIT_REDIS_URL = os.getenv('OPENAI_RATE_LIMIT_REDIS_URL', 'redis://127.0.0.1:6379/2')
+OPENAI_RATE_LIMIT_RPM = int(os.getenv('OPENAI_RATE_LIMIT_RPM', 500) or 0)  # 분당 요청 수
+OPENAI_RATE_LIMIT_TPM = int(os.getenv('OPENAI_RATE_LIMIT_TPM', 30000) or 0)  # 분당 토큰 수 (예상치 기준)
+OPENAI_RATE_LIMIT_COMPLETION_TOKENS = 500  # 요청 1건의 응답 토큰 예상치
+# 한도 중 사용자 요청(interactive: 프로필 생성/수정, 마감 공고 즉시 분석) 전용 몫 (0 이상 1 미만)
+# 공고 백필 등 bulk 작업은 나머지 몫만 사용, interactive는 전용 몫을 먼저 쓰고 모자라면 나머지 몫도 사용
+OPENAI_RATE_LIMIT_INTERACTIVE_RESERVE = float(os.getenv('OPENAI_RATE_LIMIT_INTERACTIVE_RESERVE', 0.3))
 
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
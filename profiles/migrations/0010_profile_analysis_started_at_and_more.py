@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0009_alter_profile_is_married'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='analysis_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='analysis_heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
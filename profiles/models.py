@@ -48,6 +48,9 @@ class Profile(models.Model):
         null=True,
         blank=True
     )
+    # 분석 진행 기록: 중단된 분석을 이어서 할 때 기준 시각, 멈춘 분석 감지용 마지막 진행 시각
+    analysis_started_at = models.DateTimeField(null=True, blank=True)
+    analysis_heartbeat_at = models.DateTimeField(null=True, blank=True)
     @property
     def age(self):
         try:
@@ -1,15 +1,32 @@
 # profiles/tasks.py
-from celery import shared_task
+from celery import chord, shared_task
+from celery.result import AsyncResult
+from django.conf import settings
+from django.core.cache import caches
 from django.contrib.auth import get_user_model
 from profiles.models import Profile
-from announcements.models import Announcement, HousingEligibilityAnalysis
+from announcements.models import Announcement, HousingEligibilityAnalysis, EligibilityVerdict
 import analyzer
 import logging
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.connection import ConnectionProxy
 from requests.exceptions import HTTPError
 
 User = get_user_model()
 logger = logging.getLogger('celery.tasks')
 
+# 분석 실행 조정 상태(세대 번호, 큐 대기 표시, 대상 공고, 락)는 LRU로 지워지면 안 되므로
+# 판정 캐시가 있는 default 대신 축출하지 않는 coordination 캐시에 저장
+coordination_cache = ConnectionProxy(caches, 'coordination')
+
+# 미리 분석하는 공고 상태 (마감 공고는 상세 페이지를 열 때 analyze_announcement_on_demand로 분석)
+ANALYSIS_STATUSES = ['open', 'upcoming']
+
 
 def profile_to_user_data(profile: Profile) -> dict:
     return {
@@ -33,73 +50,535 @@ def profile_to_user_data(profile: Profile) -> dict:
     }
 
 
-@shared_task(bind=True, queue='profile')
-def analyze_user_eligibility_task(self, user_id: int):
-    logger.info(f"[CELERY] 자격 분석 시작 - user_id={user_id}")
+def resolve_notice_verdicts(user_data: dict, notices: dict, deadline: float = None) -> dict:
+    """
+    {공고ID: notice_json} → {공고ID: 분석 결과}
+    같은 자격 판정 지문의 결과가 이미 있으면 복사하고, 처음 보는 지문만 분석
+    deadline이 지나 분석하지 못한 공고는 결과에서 빠짐
+    """
+    fingerprints = {
+        ann_id: analyzer.eligibility_fingerprint(user_data, notice_json)
+        for ann_id, notice_json in notices.items()
+    }
+    known = {
+        v.fingerprint: v
+        for v in EligibilityVerdict.objects.filter(fingerprint__in=set(fingerprints.values()))
+    }
+
+    to_analyze = {
+        ann_id: notice_json for ann_id, notice_json in notices.items()
+        if fingerprints[ann_id] not in known
+    }
+    analyzed = analyzer.analyze_notices_concurrently(user_data, to_analyze, deadline=deadline)
+
+    EligibilityVerdict.objects.bulk_create([
+        EligibilityVerdict(
+            fingerprint=fingerprints[ann_id],
+            announcement_id=ann_id,
+            is_eligible=result.get("is_eligible", False),
+            priority=result.get("priority", ""),
+            reasons=result.get("reasons", []),
+            decided_by=result.get("decided_by", analyzer.DECIDED_BY_LLM),
+        )
+        for ann_id, result in analyzed.items()
+    ], ignore_conflicts=True)
+
+    logger.info(f"[CELERY] 판정 재사용 {len(notices) - len(to_analyze)}건 / 신규 분석 {len(to_analyze)}건")
+
+    results = {}
+    for ann_id in notices:
+        fp = fingerprints[ann_id]
+        if fp in known:
+            results[ann_id] = known[fp].to_result()
+        elif ann_id in analyzed:
+            results[ann_id] = analyzed[ann_id]
+    return results
+
+
+def find_affected_announcements(changed_fields: list) -> tuple:
+    """
+    바뀐 프로필 필드로 판정이 달라질 수 있는 공고 ID 목록과 전체 분석 대상 공고 수
+    (예: car_value만 바뀌면 자동차가액 기준이 있는 공고만 재분석)
+    """
+    announcements = Announcement.objects.filter(
+        status__in=ANALYSIS_STATUSES
+    ).only('id', 'eligibility_criteria')
+
+    affected_ids = []
+    total = 0
+    for ann in announcements:
+        total += 1
+        if analyzer.is_affected_by_profile_change(changed_fields, ann.eligibility_criteria):
+            affected_ids.append(ann.id)
+    return affected_ids, total
+
+
+def mark_lazy_analyses_stale(user_id: int, changed_fields: list) -> int:
+    """
+    프로필 변경에 영향받는 마감 공고 결과를 stale로 표시 (미리 재분석하지 않고 다음 조회 때 다시 분석)
+    """
+    lazy_ids = [
+        ann.id for ann in Announcement.objects.exclude(
+            status__in=ANALYSIS_STATUSES
+        ).only('id', 'eligibility_criteria')
+        if analyzer.is_affected_by_profile_change(changed_fields, ann.eligibility_criteria)
+    ]
+    return HousingEligibilityAnalysis.objects.filter(
+        user_id=user_id, announcement_id__in=lazy_ids
+    ).update(is_stale=True)
 
+
+def _lazy_lock_key(user_id: int, announcement_id: int) -> str:
+    return f"analysis:lazy:{user_id}:{announcement_id}"
+
+
+def request_announcement_analysis(user_id: int, announcement: Announcement) -> bool:
+    """
+    공고 1건 분석을 interactive 큐에 등록 (마감 공고 상세 페이지 첫 조회 등, 요청 안에서 기다리지 않음)
+    같은 (사용자, 공고)에 이미 등록/실행 중인 분석이 있으면 새로 넣지 않음
+    반환: 분석 결과가 곧 저장될 예정이면 True (프로필/요약이 없으면 False)
+    """
+    if not announcement.notice_data() or not Profile.objects.filter(user_id=user_id).exists():
+        return False
+    if coordination_cache.add(_lazy_lock_key(user_id, announcement.id), True, settings.ANALYSIS_LAZY_LOCK_TTL):
+        analyze_announcement_on_demand_task.delay(user_id, announcement.id)
+    return True
+
+
+@shared_task
+def analyze_announcement_on_demand_task(user_id: int, announcement_id: int):
+    """request_announcement_analysis로 등록된 공고 1건 분석 (끝나면 락 해제)"""
     try:
-        user = User.objects.get(id=user_id)
-        profile = Profile.objects.get(user=user)
+        announcement = Announcement.objects.select_related('summary').filter(id=announcement_id).first()
+        profile = Profile.objects.filter(user_id=user_id).first()
+        notice_json = announcement.notice_data() if announcement else None
+        if not notice_json or profile is None:
+            return
+        # 등록 후 다른 경로(전체 재분석 등)로 이미 저장됐을 수 있음
+        if HousingEligibilityAnalysis.objects.filter(
+            user_id=user_id, announcement_id=announcement_id, is_stale=False
+        ).exists():
+            return
+        results = resolve_notice_verdicts(profile_to_user_data(profile), {announcement_id: notice_json})
+        if announcement_id not in results:
+            logger.warning(f"[CELERY] 공고 즉시 분석 실패 - user={user_id}, ann={announcement_id}")
+            return
+        save_analysis_results(user_id, results)
+    finally:
+        coordination_cache.delete(_lazy_lock_key(user_id, announcement_id))
+
+
+# --- 사용자별 분석 실행 세대(generation) 관리 ---
+# 새 분석 요청이 큐에 들어갈 때마다 세대 번호가 올라가고, 이전 세대 실행은 다음 청크 경계에서 중단
+# 큐에서 아직 시작하지 않은 요청이 있으면 새 작업을 넣지 않고 대상 공고만 합침
+
+def _generation_key(user_id: int) -> str:
+    return f"analysis:generation:{user_id}"
+
+
+def _queued_key(user_id: int) -> str:
+    return f"analysis:queued:{user_id}"
+
+
+def _chunk_tasks_key(user_id: int) -> str:
+    # 실행 중인 chord의 청크 task id 목록 (requeue_stuck_analyses_task가 살아 있는 실행인지 확인)
+    return f"analysis:chunk_tasks:{user_id}"
+
+
+def _scope_key(user_id: int, state: str) -> str:
+    # state: pending(큐 대기 중인 요청의 대상) / active(실행 중인 분석의 대상)
+    return f"analysis:{state}:{user_id}"
+
+
+def current_generation(user_id: int) -> int:
+    return coordination_cache.get(_generation_key(user_id), 0)
+
+
+def is_superseded(user_id: int, generation) -> bool:
+    return generation is not None and current_generation(user_id) != generation
+
+
+def _scope_lock_key(user_id: int) -> str:
+    return f"analysis:scope_lock:{user_id}"
+
+
+@contextmanager
+def _scope_lock(user_id: int):
+    """
+    대상 공고 기록(pending/active)을 읽고 고쳐 쓰는 동안 잡는 사용자별 락
+    (동시에 들어온 수정 요청이 서로의 대상 공고를 덮어쓰지 않도록)
+    락을 오래 못 잡으면(보유자가 죽은 경우 등) 경고만 남기고 진행
+    """
+    key = _scope_lock_key(user_id)
+    deadline = time.monotonic() + settings.ANALYSIS_SCOPE_LOCK_WAIT
+    acquired = coordination_cache.add(key, True, settings.ANALYSIS_SCOPE_LOCK_TTL)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.05)
+        acquired = coordination_cache.add(key, True, settings.ANALYSIS_SCOPE_LOCK_TTL)
+    if not acquired:
+        logger.warning(f"[CELERY] 분석 대상 락 대기 초과, 락 없이 진행 - user_id={user_id}")
+    try:
+        yield
+    finally:
+        if acquired:
+            coordination_cache.delete(key)
+
+
+def _merge_scope(*scopes):
+    """대상 공고 목록 합치기 (None = 전체 공고, 하나라도 전체면 전체)"""
+    merged = set()
+    for scope in scopes:
+        if scope is None:
+            return None
+        merged.update(scope)
+    return sorted(merged)
+
+
+def _get_scope(user_id: int, state: str):
+    """기록된 대상 공고 목록 ([] = 기록 없음, None = 전체)"""
+    scope = coordination_cache.get(_scope_key(user_id, state))
+    return [] if scope is None else scope["announcement_ids"]
+
+
+def _set_scope(user_id: int, state: str, announcement_ids) -> None:
+    coordination_cache.set(_scope_key(user_id, state), {"announcement_ids": announcement_ids}, settings.ANALYSIS_RUN_STATE_TTL)
+
+
+def request_user_analysis(user_id: int, announcement_ids: list = None, resume: bool = False) -> bool:
+    """
+    사용자 분석 요청 (분석 task는 이 함수로만 큐에 넣음)
+    - 실행 중인 분석이 있으면 그 대상까지 합쳐서 새 세대로 실행하고, 이전 실행은 중단됨
+    - 아직 시작하지 않은 요청이 큐에 있으면 대상만 합치고 False 반환 (중복 요청 합치기)
+    - resume=True면 이전 실행에서 이미 저장된 공고는 건너뛰고 이어서 분석
+    """
+    with _scope_lock(user_id):
+        _set_scope(user_id, 'pending', _merge_scope(
+            announcement_ids, _get_scope(user_id, 'pending'), _get_scope(user_id, 'active')
+        ))
+
+        if not coordination_cache.add(_queued_key(user_id), True, settings.ANALYSIS_RUN_STATE_TTL):
+            logger.info(f"[CELERY] 대기 중인 분석 요청에 합침 - user_id={user_id}")
+            return False
+
+        coordination_cache.add(_generation_key(user_id), 0, None)
+        generation = coordination_cache.incr(_generation_key(user_id))
+    analyze_user_eligibility_task.delay(user_id, generation=generation, resume=resume)
+    return True
+
+
+def _start_pending_scope(user_id: int):
+    """
+    큐 대기 표시를 지우고 합쳐진 대상 공고 목록을 꺼내 실행 중(active) 대상으로 기록 (기록이 없으면 전체)
+    꺼내기와 기록 사이에 들어온 요청이 이 대상을 놓치지 않도록 락 안에서 한 번에 처리
+    """
+    with _scope_lock(user_id):
+        coordination_cache.delete(_queued_key(user_id))
+        scope = coordination_cache.get(_scope_key(user_id, 'pending'))
+        coordination_cache.delete(_scope_key(user_id, 'pending'))
+        announcement_ids = None if scope is None else scope["announcement_ids"]
+        _set_scope(user_id, 'active', announcement_ids)
+    return announcement_ids
+
+
+# --- 신규 가입자 첫 판정까지 걸린 시간 (time-to-first-verdict) ---
+
+def _first_verdict_key(user_id: int) -> str:
+    return f"analysis:first_verdict_pending:{user_id}"
+
+
+def mark_first_verdict_pending(user_id: int) -> None:
+    """프로필 생성 시점 기록 (첫 판정이 저장되면 record_first_verdict에서 측정)"""
+    coordination_cache.set(_first_verdict_key(user_id), time.time(), settings.ANALYSIS_RUN_STATE_TTL)
+
+
+def record_first_verdict(user_id: int) -> None:
+    started = coordination_cache.get(_first_verdict_key(user_id))
+    # delete가 성공한 워커 1곳에서만 기록 (청크 여러 개가 동시에 끝나도 한 번만)
+    if started is None or not coordination_cache.delete(_first_verdict_key(user_id)):
+        return
+    elapsed = time.time() - started
+    analyzer.bump_stat("ttfv_count")
+    analyzer.bump_stat("ttfv_ms_total", int(elapsed * 1000))
+    bucket = next((f"le_{b}s" for b in settings.ANALYSIS_TTFV_BUCKETS if elapsed <= b), "inf")
+    analyzer.bump_stat(f"ttfv_{bucket}")
+    logger.info(f"[CELERY] 첫 판정까지 {elapsed:.1f}s - user_id={user_id}")
+
 
-        # 상태: running
+def touch_analysis_heartbeat(user_id: int) -> None:
+    """분석이 진행 중임을 기록 (오래 갱신되지 않으면 requeue_stuck_analyses_task가 재등록)"""
+    Profile.objects.filter(user_id=user_id).update(analysis_heartbeat_at=timezone.now())
+
+
+def analyzed_since_run_start(profile: Profile):
+    """현재 분석 실행이 시작된 뒤 저장된 결과 (이어서 분석할 때 건너뛰는 공고)"""
+    if profile.analysis_started_at is None:
+        return HousingEligibilityAnalysis.objects.none()
+    return HousingEligibilityAnalysis.objects.filter(
+        user_id=profile.user_id,
+        analyzed_at__gte=profile.analysis_started_at,
+        is_stale=False,
+    )
+
+
+def save_analysis_results(user_id: int, results: dict) -> None:
+    """분석 결과를 HousingEligibilityAnalysis에 일괄 저장"""
+    HousingEligibilityAnalysis.objects.bulk_upsert_results(user_id, results)
+
+
+def merge_priority_info(results_by_user: dict) -> int:
+    """
+    {user_id: {공고ID(str): 결과}}를 프로필 요약(priority_info)에 합침 (대량 분석/배치 적재용)
+    분석 도중 다른 작업(사용자 분석, 프로필 수정)이 저장한 값을 덮어쓰지 않도록 행을 잠그고 다시 읽어서 병합
+    """
+    if not results_by_user:
+        return 0
+    with transaction.atomic():
+        profiles = list(
+            Profile.objects.select_for_update()
+            .filter(user_id__in=list(results_by_user))
+            .order_by('id')
+            .only('id', 'user_id', 'priority_info', 'is_eligible')
+        )
+        for profile in profiles:
+            priority_info = dict(profile.priority_info or {})
+            priority_info.update(results_by_user[profile.user_id])
+            profile.priority_info = priority_info
+            profile.is_eligible = any(r.get('is_eligible', False) for r in priority_info.values())
+        Profile.objects.bulk_update(profiles, ['priority_info', 'is_eligible'])
+    return len(profiles)
+
+
+def chunk_announcement_ids(announcement_ids: list, chunk_size: int) -> list:
+    return [
+        announcement_ids[i:i + chunk_size]
+        for i in range(0, len(announcement_ids), chunk_size)
+    ]
+
+
+@shared_task(bind=True)
+def analyze_user_eligibility_task(self, user_id: int, announcement_ids: list = None, generation: int = None,
+                                  resume: bool = False):
+    """
+    공고를 청크로 나눠 chord로 분배 (청크마다 다른 워커에서 분석)
+    announcement_ids가 주어지면 해당 공고만 재분석하고 나머지 결과는 유지
+    generation이 주어지면(request_user_analysis 경유) 대상은 대기 중 요청을 합친 목록
+    resume=True면 중단된 실행을 이어서: 실행 시작 후 이미 저장된 공고는 다시 분석하지 않음
+    """
+    if generation is not None:
+        if is_superseded(user_id, generation):
+            logger.info(f"[CELERY] 더 새로운 분석 요청이 있어 건너뜀 - user_id={user_id}, generation={generation}")
+            return
+        announcement_ids = _start_pending_scope(user_id)
+
+    logger.info(f"[CELERY] 자격 분석 시작 - user_id={user_id}, 대상={'전체' if announcement_ids is None else len(announcement_ids)}")
+
+    try:
+        profile = Profile.objects.get(user_id=user_id)
+
+        # 상태: running (이어서 하는 실행은 시작 시각 유지)
+        now = timezone.now()
+        resume = resume and profile.analysis_started_at is not None
+        if not resume:
+            profile.analysis_started_at = now
+        profile.analysis_heartbeat_at = now
         profile.eligibility_status = 'running'
-        profile.save(update_fields=['eligibility_status'])
+        profile.save(update_fields=['eligibility_status', 'analysis_started_at', 'analysis_heartbeat_at'])
 
         user_data = profile_to_user_data(profile)
-        results = {}
 
         announcements = Announcement.objects.filter(
-            status__in=['open', 'upcoming', 'closed']
+            status__in=ANALYSIS_STATUSES
+        )
+        if announcement_ids is not None:
+            announcements = announcements.filter(id__in=announcement_ids)
+        target_ids = list(announcements.order_by('id').values_list('id', flat=True))
+        if resume:
+            done_ids = set(analyzed_since_run_start(profile).values_list('announcement_id', flat=True))
+            logger.info(f"[CELERY] 이어서 분석 - user_id={user_id}, 완료 {len(done_ids)}건 건너뜀")
+            target_ids = [ann_id for ann_id in target_ids if ann_id not in done_ids]
+
+        partial = announcement_ids is not None
+        chunks = chunk_announcement_ids(target_ids, settings.ANALYSIS_CHUNK_SIZE)
+        if not chunks:
+            finalize_user_eligibility_task.delay([], user_id, partial, generation, resume)
+            return
+
+        header = [analyze_eligibility_chunk_task.s(user_id, user_data, chunk, generation) for chunk in chunks]
+        coordination_cache.set(
+            _chunk_tasks_key(user_id), [sig.freeze().id for sig in header], settings.ANALYSIS_RUN_STATE_TTL
         )
+        chord(header)(finalize_user_eligibility_task.s(user_id, partial, generation, resume))
+        touch_analysis_heartbeat(user_id)
+        logger.info(f"[CELERY] 청크 {len(chunks)}개 분배 - user_id={user_id}, 공고 {len(target_ids)}건")
+
+    except Exception as e:
+        # 실패 상태 남김
+        logger.exception(f"[CELERY] 분석 분배 실패 - user_id={user_id}")
+        if generation is not None and not is_superseded(user_id, generation):
+            coordination_cache.delete(_scope_key(user_id, 'active'))
+        if 'profile' in locals():
+            profile.eligibility_status = 'error'
+            profile.save(update_fields=['eligibility_status'])
 
-        for ann in announcements:
-            notice_json = ann.ai_summary_json
+        return
+
+
+@shared_task(bind=True)
+def analyze_eligibility_chunk_task(self, user_id: int, user_data: dict, announcement_ids: list, generation: int = None,
+                                  carried: dict = None):
+    """
+    공고 청크 1개 분석 후 결과 저장
+    반환: {공고ID(str): 결과}, 청크 전체가 실패하면 None (다른 청크에는 영향 없음)
+    더 새로운 분석 요청이 들어왔으면 LLM 호출 없이 빈 결과
+    시간 예산(ANALYSIS_CHUNK_TIME_BUDGET)을 넘기면 저장된 결과를 carried로 넘기고 남은 공고만 재시도
+    """
+    carried = carried or {}
+    if is_superseded(user_id, generation):
+        return {}
+    touch_analysis_heartbeat(user_id)
+    deadline = time.monotonic() + settings.ANALYSIS_CHUNK_TIME_BUDGET
+    try:
+        notices = {}
+        for ann in Announcement.objects.select_related('summary').filter(id__in=announcement_ids):
+            notice_json = ann.notice_data()
             if not notice_json:
                 continue
+            notices[ann.id] = notice_json
 
-            try:
-                # announcement 단위 예외 처리
-                result = analyzer.analyze_eligibility_with_ai(
-                    user_data, notice_json
-                )
-            except Exception as e:
-                logger.warning(
-                    f"[CELERY] AI 분석 실패 - user={user_id}, ann={ann.id}: {e}"
-                )
-                continue 
-
-            HousingEligibilityAnalysis.objects.update_or_create(
-                user=user,
-                announcement=ann,
-                defaults={
-                    'is_eligible': result.get("is_eligible", False),
-                    'priority': result.get("priority", "해당없음"),
-                    'reasons': result.get("reasons", [])
-                }
-            )
-
-            results[ann.id] = result
-
-        #결과요약
+        # 같은 지문의 기존 판정은 복사, 나머지는 동시 분석 (실패/시간 초과 공고는 결과에서 빠짐)
+        results = resolve_notice_verdicts(user_data, notices, deadline=deadline)
+        remaining = [ann_id for ann_id in notices if ann_id not in results]
+        deadline_hit = time.monotonic() >= deadline
+        if not deadline_hit:
+            for ann_id in remaining:
+                logger.warning(f"[CELERY] AI 분석 실패 - user={user_id}, ann={ann_id}")
+
+        # 분석 도중 프로필이 바뀌었으면 이전 프로필 기준 결과는 저장하지 않음
+        if is_superseded(user_id, generation):
+            return {}
+        save_analysis_results(user_id, results)
+        touch_analysis_heartbeat(user_id)
+        if results:
+            record_first_verdict(user_id)
+        carried = {**carried, **{str(ann_id): result for ann_id, result in results.items()}}
+
+    except Exception:
+        logger.exception(f"[CELERY] 청크 분석 실패 - user_id={user_id}, 공고={announcement_ids}")
+        return carried or None
+
+    # 시간 예산 초과: 저장한 결과는 두고 남은 공고만 다시 큐에 (같은 task id라 chord는 그대로 기다림)
+    if deadline_hit and remaining and not self.request.is_eager \
+            and self.request.retries < settings.ANALYSIS_CHUNK_MAX_RESUMES:
+        logger.info(f"[CELERY] 청크 시간 예산 초과 → 남은 공고 {len(remaining)}건 이어서 분석 - user_id={user_id}")
+        raise self.retry(
+            args=[user_id, user_data, remaining, generation],
+            kwargs={'carried': carried},
+            countdown=0,
+        )
+    return carried
+
+
+@shared_task
+def finalize_user_eligibility_task(chunk_results: list, user_id: int, partial: bool = False, generation: int = None,
+                                  resume: bool = False):
+    """chord 콜백: 청크 결과를 합쳐 프로필 요약과 상태를 기록 (새 세대 실행이 있으면 그쪽에 맡김)"""
+    if is_superseded(user_id, generation):
+        logger.info(f"[CELERY] 이전 세대 분석 종료 - user_id={user_id}, generation={generation}")
+        return
+    coordination_cache.delete(_chunk_tasks_key(user_id))
+    if generation is not None:
+        coordination_cache.delete(_scope_key(user_id, 'active'))
+    try:
+        profile = Profile.objects.get(user_id=user_id)
+
+        failed_chunks = sum(1 for r in chunk_results if r is None)
+        if chunk_results and failed_chunks == len(chunk_results):
+            logger.error(f"[CELERY] 전체 분석 실패 - user_id={user_id}")
+            profile.eligibility_status = 'error'
+            profile.save(update_fields=['eligibility_status'])
+            return
+
+        results = {}
+        # 이어서 한 실행이면 중단 전에 저장된 결과도 요약에 포함
+        if resume:
+            results.update({
+                str(analysis.announcement_id): analysis.to_result()
+                for analysis in analyzed_since_run_start(profile)
+            })
+        for chunk in chunk_results:
+            results.update(chunk or {})
+
+        rule_count = sum(1 for r in results.values() if r.get('decided_by') == analyzer.DECIDED_BY_RULE)
+        logger.info(
+            f"[CELERY] 규칙 판정 {rule_count}건 / AI 판정 {len(results) - rule_count}건 "
+            f"/ 실패 청크 {failed_chunks}개 - user_id={user_id}"
+        )
+
+        #결과요약 (부분 재분석이면 기존 결과에 덮어씀)
+        if partial:
+            priority_info = dict(profile.priority_info or {})
+            priority_info.update(results)
+        else:
+            priority_info = results
         profile.is_eligible = any(
-            r.get('is_eligible', False) for r in results.values()
+            r.get('is_eligible', False) for r in priority_info.values()
         )
-        profile.priority_info = results
+        profile.priority_info = priority_info
 
         profile.eligibility_status = 'done'
+        profile.analysis_heartbeat_at = timezone.now()
         profile.save(update_fields=[
             'is_eligible',
             'priority_info',
-            'eligibility_status'
+            'eligibility_status',
+            'analysis_heartbeat_at'
         ])
 
         logger.info(f"[CELERY] 자격 분석 완료 - user_id={user_id}")
 
-    except Exception as e:
-        # 실패 상태 남김
-        logger.exception(f"[CELERY] 전체 분석 실패 - user_id={user_id}")
-        if 'profile' in locals():
-            profile.eligibility_status = 'error'
-            profile.save(update_fields=['eligibility_status'])
+    except Exception:
+        logger.exception(f"[CELERY] 결과 요약 실패 - user_id={user_id}")
+        Profile.objects.filter(user_id=user_id).update(eligibility_status='error')
 
-        return
+
+def _has_pending_chunks(user_id: int) -> bool:
+    """마지막 chord의 청크 중 아직 큐에 있거나 실행/재시도 중인 것이 있으면 True"""
+    task_ids = coordination_cache.get(_chunk_tasks_key(user_id)) or []
+    return any(AsyncResult(task_id).state in ('PENDING', 'RECEIVED', 'STARTED', 'RETRY') for task_id in task_ids)
+
+
+def _recorded_scope(user_id: int):
+    """멈춘 실행의 대상 공고 (실행 중/대기 중 기록을 합침, 기록이 모두 없으면 None = 전체)"""
+    scopes = coordination_cache.get_many([_scope_key(user_id, 'active'), _scope_key(user_id, 'pending')])
+    if not scopes:
+        return None
+    return _merge_scope(*(scope["announcement_ids"] for scope in scopes.values()))
+
+
+@shared_task
+def requeue_stuck_analyses_task():
+    """
+    running 상태인데 진행 기록(heartbeat)이 ANALYSIS_STUCK_AFTER초 넘게 멈춘 프로필을 찾아 이어서 분석 등록
+    (워커 재시작, 시간 제한 초과 등으로 chord 콜백이 실행되지 못한 경우)
+    - 큐 대기 표시가 남아 있으면 아직 시작하지 않은 정상 요청이므로 건너뜀
+    - 분배된 청크 task가 아직 큐 대기/실행 중이면(붐비는 큐, 오래 걸리는 청크) 건너뜀
+      (작업이 유실됐으면 두 기록 모두 ANALYSIS_RUN_STATE_TTL 뒤에 만료되어 그 다음 실행에서 재등록)
+    - 원래 실행의 대상 공고만 이어서 분석 (부분 재분석이 전체 재분석으로 커지지 않도록)
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.ANALYSIS_STUCK_AFTER)
+    stuck = Profile.objects.filter(eligibility_status='running').filter(
+        Q(analysis_heartbeat_at__lt=cutoff) |
+        Q(analysis_heartbeat_at__isnull=True, created_at__lt=cutoff)
+    )
+
+    requeued = 0
+    for user_id in stuck.values_list('user_id', flat=True):
+        if coordination_cache.get(_queued_key(user_id)) or _has_pending_chunks(user_id):
+            continue
+        touch_analysis_heartbeat(user_id)
+        request_user_analysis(user_id, _recorded_scope(user_id), resume=True)
+        requeued += 1
+
+    if requeued:
+        logger.warning(f"[CELERY] 멈춘 자격 분석 {requeued}건 이어서 분석 등록")
+    return requeued
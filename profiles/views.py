@@ -4,7 +4,9 @@ from rest_framework import generics, permissions
 from django.core.cache import cache
 from profiles.models import Profile
 from profiles.serializers import ProfileSerializer
-from profiles.tasks import analyze_user_eligibility_task
+from profiles.tasks import (
+    request_user_analysis, find_affected_announcements, mark_first_verdict_pending, mark_lazy_analyses_stale
+)
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 from announcements.models import Announcement
@@ -40,7 +42,8 @@ class ProfileCreateView(generics.CreateAPIView):
         logger.info(f"[VIEW] 프로필 생성 완료: User {user_id}")
 
         # 비동기 분석 시작 
-        analyze_user_eligibility_task.delay(user_id)
+        mark_first_verdict_pending(user_id)
+        request_user_analysis(user_id)
         logger.info(f"[VIEW] 자격 분석 task 비동기 요청: User {user_id}")
 
         return Response(
@@ -64,32 +67,51 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     def patch(self, request, *args, **kwargs):
         user_id = request.user.id
         profile = self.get_object()
-        if profile.eligibility_status == 'running':
-            return Response(
-                {
-                    'success': False,
-                    'message': '자격 분석이 이미 진행 중입니다.',
-                    'eligibility_status': profile.eligibility_status,
-                },
-                status=409
-            )
-
+        # 분석 중에도 수정 가능: 새 요청이 진행 중인 분석을 대체함 (profiles.tasks.request_user_analysis)
         serializer = self.get_serializer(profile, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
+        previous = {field: getattr(profile, field) for field in serializer.validated_data}
         serializer.save()
         
         logger.info(f"[VIEW] 프로필 업데이트 완료: User {user_id}")
+
+        # 바뀐 필드에 영향받는 공고만 재분석, 나머지 결과는 재사용
+        changed_fields = [f for f, old in previous.items() if getattr(profile, f) != old]
+        affected_ids, total = find_affected_announcements(changed_fields)
+        # 마감 공고는 미리 분석하지 않으므로 다음 조회 때 다시 분석되도록 표시만
+        mark_lazy_analyses_stale(user_id, changed_fields)
+        full_run = profile.eligibility_status in ('idle', 'error')
+
+        if not full_run and not affected_ids:
+            logger.info(f"[VIEW] 재분석 불필요 (변경 필드: {changed_fields}): User {user_id}")
+            return Response(
+                {
+                    'success': True,
+                    'message': '프로필이 수정되었습니다. 변경 사항이 자격 분석 결과에 영향을 주지 않아 기존 결과를 유지합니다.',
+                    'reanalyzed_count': 0,
+                    'reused_count': total,
+                    'profile': ProfileSerializer(profile).data,
+                },
+                status=200
+            )
         
         profile.eligibility_status = 'running'
         profile.save(update_fields=['eligibility_status'])
 
-        analyze_user_eligibility_task.delay(user_id)
-        logger.info(f"[VIEW] 자격 재분석 task 비동기 요청: User {user_id}")
+        if full_run:
+            request_user_analysis(user_id)
+            reanalyzed_count = total
+        else:
+            request_user_analysis(user_id, affected_ids)
+            reanalyzed_count = len(affected_ids)
+        logger.info(f"[VIEW] 자격 재분석 task 비동기 요청: User {user_id} ({reanalyzed_count}/{total}건)")
 
         return Response(
             {
                 'success': True,
                 'message': '프로필이 수정되었고 자격 재분석이 시작되었습니다.',
+                'reanalyzed_count': reanalyzed_count,
+                'reused_count': total - reanalyzed_count,
                 'profile': ProfileSerializer(profile).data,
             },
             status=200
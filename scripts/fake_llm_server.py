@@ -0,0 +1,276 @@
+"""
+OpenAI 호환 chat completions 가짜 서버 (로컬 성능 측정용)
+
+실제 OpenAI 비용/네트워크 없이 analyzer를 돌려보기 위한 서버
+- POST /v1/chat/completions 만 지원
+- 프롬프트 형태(단건 / 공고 묶음 / 신청자 묶음)에 맞는 JSON 판정을 결정적으로 생성
+- --latency / --jitter 로 응답 지연, --error-rate 로 429/500 응답을 흉내냄
+- --mode record: 실제 API(--upstream)로 전달하고 응답을 --cassette(JSONL)에 기록
+- --mode replay: --cassette에 기록된 응답을 그대로 돌려줌 (없는 요청은 생성 응답, --strict면 404)
+- GET /stats: 받은 요청/오류/재생 횟수
+- --batch-input/--batch-output: 서버 없이 Batch API 요청 파일(JSONL)로 결과 파일 생성 (--error-rate 적용)
+
+사용법
+    python scripts/fake_llm_server.py --port 8765 --latency 0.8 --jitter 0.4 --error-rate 0.05
+    python scripts/fake_llm_server.py --mode record --cassette llm_cassette.jsonl --upstream https://api.openai.com/v1
+    python scripts/fake_llm_server.py --mode replay --cassette llm_cassette.jsonl
+    python scripts/fake_llm_server.py --batch-input batch_requests.jsonl --batch-output batch_results.jsonl
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python manage.py ...
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _verdict(seed: str) -> dict:
+    # 같은 입력이면 항상 같은 판정 (temperature=0 흉내)
+    digest = int(hashlib.sha256(seed.encode("utf-8")).hexdigest(), 16)
+    eligible = digest % 3 != 0
+    return {
+        "eligible": eligible,
+        "reasons": [] if eligible else ["소득 기준을 충족하지 않습니다."],
+        "priority": f"{digest % 3 + 1}순위" if eligible else "",
+    }
+
+
+def fake_completion_content(prompt: str) -> dict:
+    """analyzer 프롬프트 형태별 응답 본문 생성"""
+    applicant_indexes = re.findall(r'"applicant_index": (\d+)', prompt)
+    if applicant_indexes:
+        return {"results": [
+            {"applicant_index": int(idx), **_verdict(prompt + idx)} for idx in applicant_indexes
+        ]}
+
+    announcement_ids = re.findall(r'"announcement_id": "([^"]+)"', prompt)
+    if announcement_ids:
+        return {aid: _verdict(prompt + aid) for aid in announcement_ids}
+
+    return _verdict(prompt)
+
+
+def build_chat_response(body: dict) -> dict:
+    messages = body.get("messages", [])
+    prompt = messages[-1].get("content", "") if messages else ""
+    content = json.dumps(fake_completion_content(prompt), ensure_ascii=False)
+    return {
+        "id": "chatcmpl-fake-" + hashlib.md5(prompt.encode("utf-8")).hexdigest()[:12],
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": len(prompt) // 2,
+            "completion_tokens": len(content) // 2,
+            "total_tokens": (len(prompt) + len(content)) // 2,
+        },
+    }
+
+
+def request_key(body: dict) -> str:
+    """기록/재생용 요청 키 (모델 + 메시지 + 응답 형식)"""
+    canonical = json.dumps(
+        {k: body.get(k) for k in ("model", "messages", "temperature", "response_format")},
+        ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """요청 키 → 응답을 JSONL 파일로 기록/재생"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["key"]] = entry["response"]
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: str):
+        return self.entries.get(key)
+
+    def record(self, key: str, response: dict):
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = response
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "response": response}, ensure_ascii=False) + "\n")
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    # keep-alive 동작 확인을 위해 HTTP/1.1 사용
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    mode = "generate"
+    strict = False
+    upstream = None
+    cassette = None
+    stats = {"requests": 0, "errors": 0, "replayed": 0, "recorded": 0}
+    stats_lock = threading.Lock()
+
+    @classmethod
+    def bump(cls, name: str):
+        with cls.stats_lock:
+            cls.stats[name] += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            self._send_json(200, self.stats)
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def _forward_upstream(self, raw: bytes) -> dict:
+        req = urllib.request.Request(
+            self.upstream.rstrip("/") + "/chat/completions",
+            data=raw,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": self.headers.get("Authorization", ""),
+            },
+            method="POST",
+        )
+        with urllib.request.urlopen(req, timeout=120) as resp:
+            return json.loads(resp.read())
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) or b"{}"
+        body = json.loads(raw)
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        self.bump("requests")
+
+        key = request_key(body)
+        if self.mode == "replay":
+            recorded = self.cassette.get(key)
+            if recorded is not None:
+                self.bump("replayed")
+                self._send_json(200, recorded)
+                return
+            if self.strict:
+                self._send_json(404, {"error": {"message": f"no recorded response for {key[:12]}"}})
+                return
+
+        if self.mode == "record":
+            try:
+                response = self._forward_upstream(raw)
+            except urllib.error.HTTPError as e:
+                self.bump("errors")
+                self._send_json(e.code, {"error": {"message": f"upstream error {e.code}"}})
+                return
+            self.cassette.record(key, response)
+            self.bump("recorded")
+            self._send_json(200, response)
+            return
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        # 429/500 오류 흉내 (재시도/백오프 동작 확인용)
+        if self.error_rate and random.random() < self.error_rate:
+            self.bump("errors")
+            status = random.choice([429, 500])
+            self._send_json(status, {"error": {"message": "fake error", "type": "rate_limit" if status == 429 else "server_error"}})
+            return
+
+        self._send_json(200, build_chat_response(body))
+
+
+def run_batch_file(input_path: str, output_path: str, error_rate: float = 0.0) -> int:
+    """Batch API 요청 파일 → 결과 파일 (custom_id별 응답 1줄)"""
+    count = 0
+    with open(input_path, "r", encoding="utf-8") as src, open(output_path, "w", encoding="utf-8") as dst:
+        for line in src:
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            request_id = "req_fake_" + hashlib.md5(request["custom_id"].encode("utf-8")).hexdigest()[:12]
+            if error_rate and random.random() < error_rate:
+                response = {"status_code": 500, "request_id": request_id, "body": {"error": {"message": "fake error"}}}
+            else:
+                response = {"status_code": 200, "request_id": request_id, "body": build_chat_response(request["body"])}
+            dst.write(json.dumps({
+                "id": "batch_req_" + request_id[9:],
+                "custom_id": request["custom_id"],
+                "response": response,
+                "error": None,
+            }, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 호환 가짜 LLM 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 랜덤 지연 상한(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429/500 응답 비율 (0~1)")
+    parser.add_argument("--mode", choices=["generate", "record", "replay"], default="generate")
+    parser.add_argument("--cassette", type=str, default="llm_cassette.jsonl", help="record/replay용 JSONL 파일")
+    parser.add_argument("--upstream", type=str, default="https://api.openai.com/v1", help="record 모드에서 전달할 실제 API 주소")
+    parser.add_argument("--strict", action="store_true", help="replay 모드에서 기록 없는 요청은 404")
+    parser.add_argument("--batch-input", type=str, help="Batch API 요청 JSONL (지정하면 서버 대신 결과 파일 생성)")
+    parser.add_argument("--batch-output", type=str, default="batch_results.jsonl", help="Batch API 결과 JSONL")
+    args = parser.parse_args()
+
+    if args.batch_input:
+        count = run_batch_file(args.batch_input, args.batch_output, args.error_rate)
+        print(f"✅ 배치 결과 {count}건 생성: {args.batch_output}")
+        return
+
+    FakeLLMHandler.latency = args.latency
+    FakeLLMHandler.jitter = args.jitter
+    FakeLLMHandler.error_rate = args.error_rate
+    FakeLLMHandler.mode = args.mode
+    FakeLLMHandler.strict = args.strict
+    FakeLLMHandler.upstream = args.upstream
+    if args.mode in ("record", "replay"):
+        FakeLLMHandler.cassette = Cassette(args.cassette)
+
+    server = ThreadingHTTPServer((args.host, args.port), FakeLLMHandler)
+    print(f"🚀 가짜 LLM 서버 실행: http://{args.host}:{args.port}/v1 "
+          f"(mode={args.mode}, latency={args.latency}s, error_rate={args.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()